@@ -0,0 +1,307 @@
+"""
+Benchmarks of the spec build, the spec view and request validation on
+synthetic apps.
+
+    python -m benchmarks.specs
+    python -m benchmarks.specs --sizes 10 100 --styles docstring file
+    python -m benchmarks.specs --save baseline.json
+    python -m benchmarks.specs --compare baseline.json --tolerance 0.25
+
+Each app has `size` routes written in one style: `docstring`, `file`
+(`swag_from` a YAML file), `specs_dict` (`swag_from` a dict), `view`
+(`SwaggerView` attributes) or `marshmallow` (`SwaggerView` with marshmallow
+schemas). The metrics are:
+
+- cold: first `get_apispecs`, every cache empty
+- rebuild: `get_apispecs` again with the parsed views cached, as in
+  debug mode with `incremental_specs`
+- peak_kb: peak memory allocated during the cold build
+- spec_rps: requests per second of the spec view
+- validate_us: latency of `validate()` of a request body
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from flask import Flask
+
+import flasgger.utils
+from flasgger import Schema, Swagger, SwaggerView, fields, swag_from
+from flasgger.utils import validate
+
+SIZES = (10, 100, 1000, 5000)
+STYLES = ('docstring', 'file', 'specs_dict', 'view', 'marshmallow')
+METRICS = ('cold', 'rebuild', 'peak_kb', 'spec_rps', 'validate_us')
+# metrics where a higher value is a regression
+LOWER_IS_BETTER = ('cold', 'rebuild', 'peak_kb', 'validate_us')
+
+ITEM_YAML = """
+Item {i}
+---
+tags:
+  - items{tag}
+parameters:
+  - name: item_id
+    in: path
+    type: integer
+    required: true
+  - name: body
+    in: body
+    required: true
+    schema:
+      id: Item{i}
+      required: [name]
+      properties:
+        name:
+          type: string
+        price:
+          type: number
+          minimum: 0
+        tags:
+          type: array
+          items:
+            type: string
+responses:
+  200:
+    description: The item
+    schema:
+      $ref: '#/definitions/Item{i}'
+"""
+
+
+def item_specs(i):
+    """
+    Returns the specs dict of the route i
+    """
+    return {
+        'tags': ['items{}'.format(i % 10)],
+        'parameters': [
+            {'name': 'item_id', 'in': 'path', 'type': 'integer',
+             'required': True},
+            {'name': 'body', 'in': 'body', 'required': True, 'schema': {
+                'id': 'Item{}'.format(i),
+                'required': ['name'],
+                'properties': {
+                    'name': {'type': 'string'},
+                    'price': {'type': 'number', 'minimum': 0},
+                    'tags': {'type': 'array', 'items': {'type': 'string'}},
+                },
+            }},
+        ],
+        'responses': {
+            200: {'description': 'The item',
+                  'schema': {'$ref': '#/definitions/Item{}'.format(i)}},
+        },
+    }
+
+
+def make_view(app, style, i, doc_dir):
+    rule = '/items{}/<int:item_id>'.format(i)
+    name = 'item{}'.format(i)
+
+    if style in ('view', 'marshmallow'):
+        attrs = {'tags': ['items{}'.format(i % 10)],
+                 'post': lambda self, item_id: 'ok'}
+        if style == 'view':
+            specs = item_specs(i)
+            attrs['parameters'] = specs['parameters']
+            attrs['responses'] = specs['responses']
+        else:
+            schema = type('Item{}'.format(i), (Schema,), {
+                'name': fields.Str(required=True),
+                'price': fields.Float(),
+                'tags': fields.List(fields.Str()),
+            })
+            attrs['parameters'] = schema
+            attrs['responses'] = {
+                200: {'description': 'The item', 'schema': schema}}
+        view = type('Item{}View'.format(i), (SwaggerView,), attrs)
+        app.add_url_rule(rule, view_func=view.as_view(name),
+                         methods=['POST'])
+        return
+
+    def view(item_id):
+        return 'ok'
+    view.__name__ = name
+
+    if style == 'docstring':
+        view.__doc__ = ITEM_YAML.format(i=i, tag=i % 10)
+    elif style == 'file':
+        path = os.path.join(doc_dir, '{}.yml'.format(name))
+        with open(path, 'w') as f:
+            f.write(ITEM_YAML.format(i=i, tag=i % 10))
+        view = swag_from(path)(view)
+    elif style == 'specs_dict':
+        view = swag_from(item_specs(i))(view)
+    else:
+        raise ValueError('Unknown style {}'.format(style))
+    app.add_url_rule(rule, view_func=view, methods=['POST'])
+
+
+def make_app(size, style, doc_dir):
+    """
+    Returns (app, swagger) with size routes written in style
+    """
+    app = Flask('bench_{}_{}'.format(style, size))
+    swagger = Swagger(app, config=dict(
+        Swagger.DEFAULT_CONFIG, incremental_specs=True))
+    for i in range(size):
+        make_view(app, style, i, doc_dir)
+    return app, swagger
+
+
+def clear_caches():
+    for cache in (flasgger.utils.file_cache, flasgger.utils.yaml_cache,
+                  flasgger.utils.compiled_schemas):
+        cache.clear()
+
+
+def timed(func, repeat=1):
+    """
+    Returns the best time of repeat calls of func, in seconds
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench(size, style, requests=200):
+    """
+    Returns the metrics of an app with size routes written in style
+    """
+    if style == 'marshmallow' and Schema is None:
+        return None
+    doc_dir = tempfile.mkdtemp(prefix='flasgger_bench_')
+    try:
+        clear_caches()
+        app, swagger = make_app(size, style, doc_dir)
+        endpoint = swagger.config['specs'][0]['endpoint']
+        route = swagger.config['specs'][0]['route']
+        results = {}
+
+        with app.app_context():
+            results['cold'] = timed(lambda: swagger.get_apispecs(endpoint))
+
+            def rebuild():
+                swagger.apispecs.clear()
+                swagger.get_apispecs(endpoint)
+            # debug mode, where the cached views are verified on every build
+            app.debug = True
+            try:
+                results['rebuild'] = timed(rebuild, repeat=3)
+            finally:
+                app.debug = False
+
+            # traced apart, tracemalloc slows the build down
+            clear_caches()
+            swagger.specs_cache.clear()
+            swagger.apispecs.clear()
+            tracemalloc.start()
+            swagger.get_apispecs(endpoint)
+            results['peak_kb'] = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+
+        client = app.test_client()
+        client.get(route)
+        elapsed = timed(lambda: [client.get(route) for _ in range(requests)])
+        results['spec_rps'] = requests / elapsed
+
+        specs = item_specs(0)
+        payload = {'name': 'chair', 'price': 10.5, 'tags': ['wood']}
+        with app.test_request_context(
+                '/items0/1', method='POST', json=payload):
+            validate(payload, 'Item0', specs=specs)
+            elapsed = timed(lambda: [
+                validate(payload, 'Item0', specs=specs)
+                for _ in range(requests)])
+        results['validate_us'] = elapsed / requests * 1e6
+        results['cold'] *= 1000
+        results['rebuild'] *= 1000
+        return results
+    finally:
+        shutil.rmtree(doc_dir, ignore_errors=True)
+
+
+def run(sizes=SIZES, styles=STYLES, requests=200, out=sys.stdout):
+    """
+    Runs the benchmarks, printing a row per app as they complete.
+    Returns {"<style>-<size>": {metric: value}}
+    """
+    header = '{0:<12}{1:>6}{2:>12}{3:>12}{4:>10}{5:>10}{6:>13}'
+    row = '{0:<12}{1:>6}{2:>12.1f}{3:>12.1f}{4:>10.0f}{5:>10.0f}{6:>13.1f}'
+    out.write(header.format('style', 'size', 'cold ms', 'rebuild ms',
+                            'peak kB', 'spec rps', 'validate us') + '\n')
+    results = {}
+    for size in sizes:
+        for style in styles:
+            metrics = bench(size, style, requests)
+            if metrics is None:
+                continue
+            results['{}-{}'.format(style, size)] = metrics
+            out.write(row.format(
+                style, size, *[metrics[metric] for metric in METRICS]) + '\n')
+            out.flush()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns the descriptions of the metrics of results worse than in
+    baseline by more than tolerance (a ratio)
+    """
+    regressions = []
+    for key, metrics in sorted(results.items()):
+        for metric, value in sorted(metrics.items()):
+            previous = baseline.get(key, {}).get(metric)
+            if not previous:
+                continue
+            if metric in LOWER_IS_BETTER:
+                ratio = value / previous
+            else:
+                ratio = previous / value
+            if ratio > 1 + tolerance:
+                regressions.append('{} {}: {:.1f} -> {:.1f}'.format(
+                    key, metric, previous, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', nargs='+', type=int, default=SIZES)
+    parser.add_argument('--styles', nargs='+', choices=STYLES,
+                        default=STYLES)
+    parser.add_argument('--requests', type=int, default=200,
+                        help='requests per throughput/latency measure')
+    parser.add_argument('--save', help='write the results to this file')
+    parser.add_argument('--compare',
+                        help='fail on regressions against this file')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='ratio of slowdown tolerated by --compare')
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.styles, args.requests)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=4, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            sys.stderr.write('Regression: {}\n'.format(regression))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
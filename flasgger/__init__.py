@@ -8,6 +8,6 @@ __email__ = 'flasgger@flasgger.org'
 
 from jsonschema import ValidationError  # noqa
 from .base import Swagger, Flasgger, NO_SANITIZER, BR_SANITIZER, MK_SANITIZER, LazyJSONEncoder  # noqa
-from .utils import swag_from, validate, apispec_to_template, LazyString  # noqa
+from .utils import swag_from, validate, apispec_to_template, LazyString, SpecsProfile  # noqa
 from .marshmallow_apispec import APISpec, SwaggerView, Schema, fields  # noqa
 from .constants import OPTIONAL_FIELDS  # noqa
@@ -8,22 +8,30 @@ we add the endpoint to swagger specification output
 """
 import re
 import os
-import codecs
-import yaml
+import copy
+import gzip
+import hashlib
+import logging
+import mimetypes
+import threading
+import time
 try:
     import simplejson as json
 except ImportError:
     import json
 from functools import wraps, partial
 from collections import defaultdict
+from datetime import datetime, timezone
 from flask import Blueprint
 from flask import current_app
+from flask import json as flask_json
 from flask import jsonify, Response
 from flask import redirect
 from flask import render_template
 from flask import request, url_for
 from flask import abort
 from flask.views import MethodView
+from werkzeug.security import safe_join
 try:
     from flask.json.provider import DefaultJSONProvider
 except ImportError:
@@ -32,6 +40,13 @@ try:
     from flask_restful.reqparse import RequestParser
 except ImportError:
     RequestParser = None
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
 import jsonschema
 try:
     from markupsafe import Markup
@@ -40,15 +55,30 @@ except ImportError:
 from mistune import markdown
 from .constants import OPTIONAL_FIELDS, OPTIONAL_OAS3_FIELDS
 from .utils import LazyString
+from .utils import LRUCache
+from .utils import CompiledSchema
+from .utils import SpecsCache
+from .utils import build_schema_registry
+from .utils import compile_schema
+from .utils import compiled_schemas
 from .utils import extract_definitions
-from .utils import get_schema_specs
+from .utils import file_cache
+from .utils import get_referenced_definitions
 from .utils import get_specs
+from .utils import get_specs_profile
 from .utils import get_vendor_extension_fields
+from .utils import has_lazy_strings
 from .utils import is_openapi3
+from .utils import load_yaml
 from .utils import parse_definition_docstring
 from .utils import parse_imports
+from .utils import profile_phase
+from .utils import prune_definitions
+from .utils import read_file
+from .utils import split_apispecs
 from .utils import swag_annotation
 from .utils import validate
+from .utils import yaml_cache
 from .utils import extract_schema
 from . import __version__
 
@@ -73,6 +103,11 @@ class APIDocsView(MethodView):
     def __init__(self, *args, **kwargs):
         view_args = kwargs.pop('view_args', {})
         self.config = view_args.get('config')
+        self.static_url = view_args.get('static_url')
+        # LRUCache (script root, host) -> (inlined spec etag, etag, html),
+        # None unless `cache_apidocs`
+        self.pages = view_args.get('pages')
+        self.spec_loader = view_args.get('spec_loader')
         super(APIDocsView, self).__init__(*args, **kwargs)
 
     def get(self):
@@ -80,6 +115,39 @@ class APIDocsView(MethodView):
         The data under /apidocs
         json or Swagger UI
         """
+        if request.args.get('json'):
+            # calling with ?json returns specs
+            return jsonify(self.get_data())
+
+        # a cached page is rendered again when the inlined spec changed,
+        # and never cached in debug
+        spec = self.get_inline_spec()
+        spec_etag = spec.etag if spec is not None else None
+        key = (request.script_root, request.host)
+        cache = self.pages is not None and not current_app.debug
+        page = self.pages.get(key) if cache else None
+        if page is None or page[0] != spec_etag:
+            html = self.render(spec).encode('utf-8')
+            page = (spec_etag, hashlib.sha1(html).hexdigest(), html)
+            if cache:
+                self.pages.set(key, page)
+        return make_encoded_response(page[2], {}, page[1], 'text/html')
+
+    def get_inline_spec(self):
+        """
+        Returns the `SerializedSpec` to embed in the page with
+        `inline_spec`, None when the page lists several specs by name
+        """
+        specs = self.config.get('specs', [])
+        if not self.config.get('inline_spec') or self.spec_loader is None \
+                or not specs or any(spec.get('name') for spec in specs):
+            return None
+        return self.spec_loader(endpoint=specs[0]['endpoint'])
+
+    def get_data(self):
+        """
+        Returns the specs listed by the page
+        """
         base_endpoint = self.config.get('endpoint', 'flasgger')
         specs = [
             {
@@ -98,57 +166,47 @@ class APIDocsView(MethodView):
             }
             for spec in specs if spec["name"]
         ]
-        data = {
+        return {
             "specs": specs,
             "urls": urls,
             "title": self.config.get('title', 'Flasgger')
         }
-        if request.args.get('json'):
-            # calling with ?json returns specs
-            return jsonify(data)
-        else:  # pragma: no cover
-            data['flasgger_config'] = self.config
-            data['json'] = json
-            data['flasgger_version'] = __version__
-            data['favicon'] = self.config.get(
-                'favicon',
-                url_for(
-                    '{0}.static'.format(base_endpoint),
-                    filename='favicon-32x32.png'
-                )
-            )
-            data['swagger_ui_bundle_js'] = self.config.get(
-                'swagger_ui_bundle_js',
-                url_for(
-                    '{0}.static'.format(base_endpoint),
-                    filename='swagger-ui-bundle.js'
-                )
-            )
-            data['swagger_ui_standalone_preset_js'] = self.config.get(
-                'swagger_ui_standalone_preset_js',
-                url_for(
-                    '{0}.static'.format(base_endpoint),
-                    filename='swagger-ui-standalone-preset.js'
-                )
-            )
-            data['jquery_js'] = self.config.get(
-                'jquery_js',
-                url_for(
-                    '{0}.static'.format(base_endpoint),
-                    filename='lib/jquery.min.js'
-                )
-            )
-            data['swagger_ui_css'] = self.config.get(
-                'swagger_ui_css',
-                url_for(
-                    '{0}.static'.format(base_endpoint),
-                    filename='swagger-ui.css'
-                )
-            )
-            return render_template(
-                'flasgger/index.html',
-                **data
-            )
+
+    def render(self, spec=None):
+        """
+        Returns the Swagger UI page, embedding the `SerializedSpec` spec
+        """
+        base_endpoint = self.config.get('endpoint', 'flasgger')
+        static_url = self.static_url or partial(
+            url_for, '{0}.static'.format(base_endpoint))
+        data = self.get_data()
+        data['flasgger_config'] = self.config
+        data['json'] = json
+        data['flasgger_version'] = __version__
+        data['inline_spec'] = None
+        if spec is not None:
+            # safe in a <script>, as any markup is escaped
+            data['inline_spec'] = Markup(
+                spec.data.decode('utf-8')
+                .replace('<', '\\u003c').replace('>', '\\u003e')
+                .replace('&', '\\u0026').replace('\u2028', '\\u2028')
+                .replace('\u2029', '\\u2029'))
+        # the default urls are built only for the files not overridden
+        for key, filename in (
+                ('favicon', 'favicon-32x32.png'),
+                ('swagger_ui_bundle_js', 'swagger-ui-bundle.js'),
+                ('swagger_ui_standalone_preset_js',
+                 'swagger-ui-standalone-preset.js'),
+                ('jquery_js', 'lib/jquery.min.js'),
+                ('swagger_ui_css', 'swagger-ui.css')):
+            if key in self.config:
+                data[key] = self.config[key]
+            else:
+                data[key] = static_url(filename=filename)
+        return render_template(
+            'flasgger/index.html',
+            **data
+        )
 
 
 class OAuthRedirect(MethodView):
@@ -161,6 +219,116 @@ class OAuthRedirect(MethodView):
         )
 
 
+class SerializedSpec(object):
+    """
+    A spec encoded once as JSON bytes, with the validators used to answer
+    conditional requests and, when `compress` is set, its brotli (if the
+    module is available) and gzip encodings.
+
+    Specs holding `LazyString` values are `lazy`: they must be encoded
+    again for every request, so they are not compressed ahead of time.
+    `data` gives the bytes of an already encoded spec, e.g. a snapshot.
+    """
+
+    def __init__(self, spec, compress=False, lazy=None, data=None):
+        self.spec = spec
+        self.lazy = has_lazy_strings(spec) if lazy is None else lazy
+        if data is None:
+            try:
+                data = flask_json.dumps(spec)
+            except:  # noqa
+                logging.exception('jsonify failure; defaulting to json.dumps')
+                data = json.dumps(spec)
+            data = data.encode('utf-8')
+        self.data = data
+        self.etag = hashlib.sha1(self.data).hexdigest()
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        self.encodings = {}  # ordered by preference
+        if compress and not self.lazy:
+            if brotli is not None:
+                self.encodings['br'] = brotli.compress(self.data, quality=9)
+            self.encodings['gzip'] = gzip.compress(self.data)
+
+    def make_response(self):
+        """
+        Returns the spec response, a 304 if the client copy is fresh
+        """
+        return make_encoded_response(
+            self.data, self.encodings, self.etag, 'application/json',
+            self.last_modified)
+
+
+class StaticAsset(object):
+    """
+    A file of the flasgger static folder, read once along with its content
+    hash and, for text files, its brotli and gzip encodings: the `.br` and
+    `.gz` siblings of the file when shipped, else compressed once.
+    """
+
+    COMPRESSED_TYPES = ('text/', 'application/javascript',
+                        'application/json', 'image/svg+xml')
+
+    def __init__(self, path, compress=True):
+        with open(path, 'rb') as f:
+            self.data = f.read()
+        self.mtime = os.path.getmtime(path)
+        self.etag = hashlib.sha1(self.data).hexdigest()
+        self.fingerprint = self.etag[:12]
+        self.mimetype = mimetypes.guess_type(path)[0] \
+            or 'application/octet-stream'
+        self.last_modified = datetime.fromtimestamp(
+            int(self.mtime), timezone.utc)
+        self.encodings = {}  # ordered by preference
+        if not compress or not self.mimetype.startswith(
+                self.COMPRESSED_TYPES):
+            return
+        compressors = (
+            ('br', '.br', brotli and partial(brotli.compress, quality=9)),
+            ('gzip', '.gz', partial(gzip.compress, compresslevel=9)),
+        )
+        for encoding, suffix, compressor in compressors:
+            if os.path.isfile(path + suffix):
+                with open(path + suffix, 'rb') as f:
+                    self.encodings[encoding] = f.read()
+            elif compressor is not None:
+                self.encodings[encoding] = compressor(self.data)
+
+    def make_response(self):
+        """
+        Returns the asset response, cacheable for a year as its url changes
+        with its content
+        """
+        response = make_encoded_response(
+            self.data, self.encodings, self.etag, self.mimetype,
+            self.last_modified)
+        response.headers['Cache-Control'] = \
+            'public, max-age=31536000, immutable'
+        return response
+
+
+def make_encoded_response(data, encodings, etag, mimetype,
+                          last_modified=None):
+    """
+    Returns the response of data, or of the encoding of data the client
+    prefers among encodings {name: bytes}, a 304 if its copy is fresh
+    """
+    encoding = None
+    if encodings:
+        encoding = request.accept_encodings.best_match(list(encodings))
+    if encoding is None:
+        response = Response(data, mimetype=mimetype)
+        response.set_etag(etag)
+    else:
+        response = Response(encodings[encoding], mimetype=mimetype)
+        response.headers['Content-Encoding'] = encoding
+        response.set_etag('{0}-{1}'.format(etag, encoding))
+    if encodings:
+        response.vary.add('Accept-Encoding')
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response.make_conditional(request)
+
+
 class APISpecsView(MethodView):
     """
     The /apispec_1.json and other specs
@@ -170,19 +338,40 @@ class APISpecsView(MethodView):
         self.loader = kwargs.pop('loader')
         super(APISpecsView, self).__init__(*args, **kwargs)
 
-    def get(self):
+    def get(self, **kwargs):
         """
         The Swagger view get method outputs to /apispecs_1.json
         """
+        specs = self.loader(**kwargs)
+        if isinstance(specs, SerializedSpec):
+            return specs.make_response()
         try:
-            return jsonify(self.loader())
+            return jsonify(specs)
         except:  # noqa
-            import logging
             logging.exception('jsonify failure; defaulting to json.dumps')
-            specs = json.dumps(self.loader())
+            specs = json.dumps(specs)
             return Response(specs, mimetype='application/json')
 
 
+class StaticAssetView(MethodView):
+    """
+    The fingerprinted static files, /flasgger_static/_h/<hash>/<filename>
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.loader = kwargs.pop('loader')
+        super(StaticAssetView, self).__init__(*args, **kwargs)
+
+    def get(self, fingerprint, filename):
+        asset = self.loader(filename)
+        if asset.fingerprint != fingerprint:
+            # a page rendered before the file changed
+            return redirect(url_for(
+                request.endpoint, fingerprint=asset.fingerprint,
+                filename=filename))
+        return asset.make_response()
+
+
 class SwaggerDefinition(object):
     """
     Class based definition
@@ -236,7 +425,7 @@ class Swagger(object):
             self, app=None, config=None, sanitizer=None, template=None,
             template_file=None, decorators=None, validation_function=None,
             validation_error_handler=None, parse=False, format_checker=None,
-            merge=False
+            merge=False, snapshot=None
     ):
         self._configured = False
         self.endpoints = []
@@ -247,6 +436,7 @@ class Swagger(object):
 
         self.template = template
         self.template_file = template_file
+        self.snapshot = snapshot
         self.decorators = decorators
         self.format_checker = format_checker or jsonschema.FormatChecker()
 
@@ -258,12 +448,23 @@ class Swagger(object):
         def default_error_handler(e, _, __):
             return abort(400, e.message)
 
+        self.default_validation_function = default_validation_function
         self.validation_function = validation_function\
             or default_validation_function
 
         self.validation_error_handler = validation_error_handler\
             or default_error_handler
         self.apispecs = {}  # cached apispecs
+        self.serialized_apispecs = {}  # endpoint -> SerializedSpec
+        self.apispecs_parts = {}  # endpoint -> (spec, {tag: part})
+        self.apispecs_indexes = {}  # endpoint -> (spec, script root, index)
+        self.specs_cache = SpecsCache()  # parsed operations
+        self.schema_registry = None  # lower-cased schema id -> view specs
+        self.validated_views = False  # a view is decorated with validate
+        self.compiled_schemas = {}  # schema id -> CompiledSchema
+        self.static_folder = None  # of the flasgger blueprint
+        self.static_assets = {}  # filename -> StaticAsset
+        self.apidocs_pages = LRUCache(maxsize=32)  # see APIDocsView
         self.parse = parse
         if app:
             self.init_app(app)
@@ -277,6 +478,7 @@ class Swagger(object):
         self.app.add_url_rule = swag_annotation(self.app.add_url_rule)
 
         self.load_config(app)
+        self.resize_caches()
         # self.load_apispec(app)
         if self.template_file is not None:
             self.template = self.load_swagger_file(self.template_file)
@@ -286,13 +488,29 @@ class Swagger(object):
         if self.parse:
             if RequestParser is None:
                 raise RuntimeError('Please install flask_restful')
-            self.parsers = {}
-            self.schemas = {}
+            # (rule endpoint, rule, method) -> parsing bundle or None
+            self.parse_index = {}
             self.parse_request(app)
 
+        if self.config.get('warmup'):
+            self.add_warmup(app)
+
         self._configured = True
         app.swag = self
 
+    def resize_caches(self):
+        """
+        Resizes the module caches of compiled schemas, file texts and parsed
+        YAML documents to the `compiled_schemas_cache_size`,
+        `file_cache_size` and `yaml_cache_size` of the config, when set.
+        They are shared by every Swagger of the process.
+        """
+        for key, cache in (('compiled_schemas_cache_size', compiled_schemas),
+                           ('file_cache_size', file_cache),
+                           ('yaml_cache_size', yaml_cache)):
+            if self.config.get(key) is not None:
+                cache.resize(self.config[key])
+
     def load_swagger_file(self, filename):
         if not filename.startswith('/'):
             filename = os.path.join(
@@ -300,23 +518,17 @@ class Swagger(object):
                 filename
             )
 
+        contents = read_file(filename)
         if filename.endswith('.json'):
-            loader = json.load
+            return json.loads(contents)
         elif filename.endswith('.yml') or filename.endswith('.yaml'):
-            def loader(stream):
-                return yaml.safe_load(parse_imports(stream.read(), filename))
+            return load_yaml(parse_imports(contents, filename),
+                             self.config.get('yaml_loader'))
+        elif contents.strip()[0] in ['{', '[']:
+            return json.loads(contents)
         else:
-            with codecs.open(filename, 'r', 'utf-8') as f:
-                contents = f.read()
-                contents = contents.strip()
-                if contents[0] in ['{', '[']:
-                    loader = json.load
-                else:
-                    def loader(stream):
-                        return yaml.safe_load(
-                            parse_imports(stream.read(), filename))
-        with codecs.open(filename, 'r', 'utf-8') as f:
-            return loader(f)
+            return load_yaml(parse_imports(contents, filename),
+                             self.config.get('yaml_loader'))
 
     @property
     def configured(self):
@@ -347,9 +559,85 @@ class Swagger(object):
             if model_filter(definition)
         }
 
-    def get_apispecs(self, endpoint='apispec_1'):
-        if not self.app.debug and endpoint in self.apispecs:
-            return self.apispecs[endpoint]
+    def get_specs_cache(self):
+        """
+        Returns the `SpecsCache` shared by every spec endpoint, so each view
+        is parsed once however many specs include it. None in debug mode,
+        where views are parsed again on every build, unless
+        `incremental_specs` is set.
+        """
+        if self.app.debug and not self.config.get('incremental_specs'):
+            return None
+        return self.specs_cache
+
+    def compress_specs(self):
+        """
+        Whether the serialized specs store compressed encodings, set by
+        `compress_specs`. Never in debug mode, where the specs are
+        serialized again on every build.
+        """
+        return bool(self.config.get('compress_specs')) and not self.app.debug
+
+    def get_snapshot_path(self, endpoint='apispec_1'):
+        """
+        Returns the path of the snapshot of endpoint, from its spec
+        `snapshot` or else the `snapshot` given to Swagger or set in the
+        config, where `{endpoint}` is replaced. None if it has no snapshot.
+        """
+        for spec in self.config['specs']:
+            if spec['endpoint'] == endpoint:
+                break
+        else:
+            return None
+        path = spec.get('snapshot') or self.snapshot \
+            or self.config.get('snapshot')
+        if not path:
+            return None
+        path = path.format(endpoint=endpoint)
+        if not os.path.isabs(path):
+            path = os.path.join(self.app.root_path, path)
+        return path
+
+    def load_snapshot(self, endpoint='apispec_1'):
+        """
+        Loads the snapshot of endpoint, a spec written beforehand by
+        `flask generate-api-schema`, and caches it as the spec and the
+        serialized spec of endpoint. Returns its `SerializedSpec`, or None
+        if endpoint has no snapshot or the file is missing.
+        """
+        path = self.get_snapshot_path(endpoint)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as snapshot:
+                data = snapshot.read()
+            mtime = os.path.getmtime(path)
+        except (IOError, OSError):
+            logging.warning(
+                'Snapshot %s of %s not found, building the spec',
+                path, endpoint)
+            return None
+        serialized = SerializedSpec(
+            json.loads(data.decode('utf-8')),
+            compress=self.compress_specs(),
+            lazy=False, data=data)
+        serialized.last_modified = datetime.fromtimestamp(
+            int(mtime), timezone.utc)
+        self.apispecs[endpoint] = serialized.spec
+        self.serialized_apispecs[endpoint] = serialized
+        return serialized
+
+    def get_apispecs(self, endpoint='apispec_1', snapshot=True):
+        """
+        Returns the spec of endpoint, loaded from its snapshot outside
+        debug mode unless `snapshot` is False, else built from the views
+        """
+        if not self.app.debug and snapshot:
+            if endpoint in self.apispecs:
+                return self.apispecs[endpoint]
+            serialized = self.load_snapshot(endpoint)
+            if serialized is not None:
+                return serialized.spec
 
         spec = None
         for _spec in self.config['specs']:
@@ -443,7 +731,7 @@ class Swagger(object):
         for name, def_model in self.get_def_models(
                 spec.get('definition_filter')).items():
             description, swag = parse_definition_docstring(
-                def_model, self.sanitizer)
+                def_model, self.sanitizer, self.config.get('yaml_loader'))
             if name and swag:
                 if description:
                     swag.update({'description': description})
@@ -453,10 +741,15 @@ class Swagger(object):
             self.get_url_mappings(spec.get('rule_filter')), ignore_verbs,
             optional_fields, self.sanitizer,
             openapi_version=openapi_version,
-            doc_dir=self.config.get('doc_dir'))
+            doc_dir=self.config.get('doc_dir'),
+            cache=self.get_specs_cache(), verify_cache=self.app.debug,
+            yaml_loader=self.config.get('yaml_loader'))
 
+        profile = get_specs_profile()
         http_methods = ['get', 'post', 'put', 'delete']
         for rule, verbs in specs:
+            if profile is not None:
+                started = time.perf_counter()
             operations = dict()
             for verb, swag in verbs:
 
@@ -585,8 +878,9 @@ class Swagger(object):
                     pass
 
                 # old regex '(<(.*?\:)?(.*?)>)'
-                for arg in re.findall('(<([^<>]*:)?([^<>]*)>)', srule):
-                    srule = srule.replace(arg[0], '{%s}' % arg[2])
+                with profile_phase('path_rewrite'):
+                    for arg in re.findall('(<([^<>]*:)?([^<>]*)>)', srule):
+                        srule = srule.replace(arg[0], '{%s}' % arg[2])
 
                 for key, val in operations.items():
                     if srule not in paths:
@@ -595,13 +889,148 @@ class Swagger(object):
                         paths[srule][key].update(val)
                     else:
                         paths[srule][key] = val
-        self.apispecs[endpoint] = data
+            if profile is not None:
+                profile.add_rule(rule, time.perf_counter() - started)
+
+        if spec.get('prune_definitions',
+                    self.config.get('prune_definitions', False)):
+            prune_definitions(data)
+
+        # a live build must not replace the snapshot served
+        if snapshot or self.get_snapshot_path(endpoint) is None:
+            self.apispecs[endpoint] = data
 
         if is_openapi3(openapi_version):
-            del data['definitions']
+            data.pop('definitions', None)
 
         return data
 
+    def get_serialized_apispecs(self, endpoint='apispec_1'):
+        """
+        Returns the `SerializedSpec` of endpoint, encoded again only when
+        `get_apispecs` has rebuilt the spec or it holds `LazyString`s
+        """
+        return self.serialize_apispecs(endpoint, self.get_apispecs(endpoint))
+
+    def serialize_apispecs(self, key, spec):
+        """
+        Returns the `SerializedSpec` of spec, cached under key while the
+        same spec object is given
+        """
+        serialized = self.serialized_apispecs.get(key)
+        if serialized is None or serialized.spec is not spec \
+                or serialized.lazy:
+            lazy = None
+            if serialized is not None and serialized.spec is spec:
+                lazy = serialized.lazy
+            previous, serialized = serialized, SerializedSpec(
+                spec, compress=self.compress_specs(),
+                lazy=lazy)
+            if previous is not None and previous.etag == serialized.etag:
+                serialized.last_modified = previous.last_modified
+            self.serialized_apispecs[key] = serialized
+        return serialized
+
+    def get_apispecs_parts(self, endpoint='apispec_1'):
+        """
+        Returns the spec of endpoint split by tag, see `split_apispecs`,
+        split again only when `get_apispecs` has rebuilt the spec
+        """
+        spec = self.get_apispecs(endpoint)
+        cached = self.apispecs_parts.get(endpoint)
+        if cached is None or cached[0] is not spec:
+            cached = (spec, split_apispecs(spec))
+            self.apispecs_parts[endpoint] = cached
+        return cached[1]
+
+    def get_apispecs_index(self, endpoint='apispec_1'):
+        """
+        Returns the index of a split spec: its info and, for every tag, the
+        url of its part and the paths it holds. Built again only when
+        `get_apispecs` has rebuilt the spec or the app is mounted elsewhere.
+        """
+        spec = self.get_apispecs(endpoint)
+        cached = self.apispecs_indexes.get(endpoint)
+        if cached is not None and cached[0] is spec \
+                and cached[1] == request.script_root:
+            return cached[2]
+        tags = {item.get('name'): item for item in spec.get('tags', [])}
+        index = []
+        for tag, part in self.get_apispecs_parts(endpoint).items():
+            item = {
+                "name": tag,
+                "url": url_for(
+                    '{0}.{1}_tag'.format(
+                        self.config.get('endpoint', 'flasgger'), endpoint),
+                    tag=tag),
+                "paths": list(part['paths'])
+            }
+            if tags.get(tag, {}).get('description'):
+                item['description'] = tags[tag]['description']
+            index.append(item)
+        index = {"info": spec.get('info'), "tags": index}
+        self.apispecs_indexes[endpoint] = (spec, request.script_root, index)
+        return index
+
+    def get_serialized_apispecs_index(self, endpoint='apispec_1'):
+        """
+        Returns the `SerializedSpec` of the index of a split spec
+        """
+        return self.serialize_apispecs(
+            (endpoint, '__index__'), self.get_apispecs_index(endpoint))
+
+    def get_serialized_apispecs_part(self, endpoint='apispec_1', tag=None):
+        """
+        Returns the `SerializedSpec` of the tag part of a split spec
+        """
+        parts = self.get_apispecs_parts(endpoint)
+        if tag not in parts:
+            abort(404)
+        return self.serialize_apispecs((endpoint, tag), parts[tag])
+
+    def get_static_asset(self, filename):
+        """
+        Returns the `StaticAsset` of filename in the flasgger static folder,
+        read again in debug mode when the file changed. Aborts with a 404
+        if there is no such file.
+        """
+        asset = self.static_assets.get(filename)
+        if asset is not None and not self.app.debug:
+            return asset
+        path = safe_join(self.static_folder, filename) \
+            if self.static_folder else None
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        if asset is None or asset.mtime != os.path.getmtime(path):
+            asset = StaticAsset(
+                path, compress=self.config.get('compress_static', True))
+            self.static_assets[filename] = asset
+        return asset
+
+    def clear_apidocs_cache(self):
+        """
+        Drops the cached `/apidocs` pages, e.g. after changing the config
+        """
+        self.apidocs_pages.clear()
+
+    def get_static_url(self, filename):
+        """
+        Returns the url of filename in the flasgger static folder: with
+        `fingerprint_static`, a url holding its content hash served with
+        far future cache headers. The plain url for the other UI versions
+        and the files missing from the static folder.
+        """
+        base_endpoint = self.config.get('endpoint', 'flasgger')
+        if self.config.get('fingerprint_static') and self.static_folder \
+                and self.config.get('uiversion', 3) >= 3:
+            path = safe_join(self.static_folder, filename)
+            if path is not None and os.path.isfile(path):
+                return url_for(
+                    '{0}.static_fingerprinted'.format(base_endpoint),
+                    fingerprint=self.get_static_asset(filename).fingerprint,
+                    filename=filename)
+        return url_for('{0}.static'.format(base_endpoint), filename=filename)
+
     def definition(self, name, tags=None):
         """
         Decorator to add class based definitions
@@ -646,13 +1075,32 @@ class Swagger(object):
                 static_url_path=self.config.get('static_url_path', None)
             )
 
+            if blueprint.has_static_folder:
+                self.static_folder = blueprint.static_folder
+                if self.config.get('fingerprint_static'):
+                    # own prefix, not to shadow the files of subfolders
+                    blueprint.add_url_rule(
+                        '{0}/_h/<fingerprint>/<path:filename>'.format(
+                            blueprint.static_url_path),
+                        'static_fingerprinted',
+                        view_func=StaticAssetView.as_view(
+                            'static_fingerprinted',
+                            loader=self.get_static_asset)
+                    )
+
             specs_route = self.config.get('specs_route', '/apidocs/')
+            pages = None
+            if self.config.get('cache_apidocs'):
+                pages = self.apidocs_pages
             blueprint.add_url_rule(
                 specs_route,
                 'apidocs',
                 view_func=wrap_view(APIDocsView().as_view(
                     'apidocs',
-                    view_args=dict(config=self.config)
+                    view_args=dict(config=self.config,
+                                   static_url=self.get_static_url,
+                                   pages=pages,
+                                   spec_loader=self.get_serialized_apispecs)
                 ))
             )
 
@@ -688,21 +1136,129 @@ class Swagger(object):
                 view_func=wrap_view(APISpecsView.as_view(
                     spec['endpoint'],
                     loader=partial(
-                        self.get_apispecs, endpoint=spec['endpoint'])
+                        self.get_serialized_apispecs,
+                        endpoint=spec['endpoint'])
                 ))
             )
+            if spec.get('split'):
+                # /apispec_1/index.json and /apispec_1/tags/<tag>.json
+                split_route = spec.get('split_route') or re.sub(
+                    r'\.json$', '', spec['route'])
+                blueprint.add_url_rule(
+                    split_route + '/index.json',
+                    spec['endpoint'] + '_index',
+                    view_func=wrap_view(APISpecsView.as_view(
+                        spec['endpoint'] + '_index',
+                        loader=partial(
+                            self.get_serialized_apispecs_index,
+                            endpoint=spec['endpoint'])
+                    ))
+                )
+                blueprint.add_url_rule(
+                    split_route + '/tags/<path:tag>.json',
+                    spec['endpoint'] + '_tag',
+                    view_func=wrap_view(APISpecsView.as_view(
+                        spec['endpoint'] + '_tag',
+                        loader=partial(
+                            self.get_serialized_apispecs_part,
+                            endpoint=spec['endpoint'])
+                    ))
+                )
         app.register_blueprint(blueprint)
 
     def add_headers(self, app):
         """
-        Inject headers after request
+        Inject the `headers` of the config in the responses of the flasgger
+        blueprint (specs, docs and static files), or of every view of the
+        app when `headers_scope` is 'app'
         """
-        @app.after_request
+        headers = tuple(
+            (header, value)
+            for header, value in self.config.get('headers') or ())
+        if not headers:
+            return
+
         def after_request(response):  # noqa
-            for header, value in self.config.get('headers'):
+            for header, value in headers:
                 response.headers[header] = value
             return response
 
+        if self.config.get('headers_scope', 'flasgger') == 'app':
+            app.after_request(after_request)
+        else:
+            # the blueprint is registered already, so add its hook by hand
+            app.after_request_funcs.setdefault(
+                self.config.get('endpoint', 'flasgger'), []
+            ).append(after_request)
+
+    def add_warmup(self, app):
+        """
+        Warm up on the first request the app receives, in a background
+        thread if the `warmup` config is 'background'
+        """
+        lock = threading.Lock()
+        pending = [True]
+
+        @app.before_request
+        def before_request():  # noqa
+            if pending:
+                with lock:
+                    if not pending:
+                        return
+                    pending.pop()
+                if self.config.get('warmup') == 'background':
+                    self.warmup(background=True)
+                    return
+                # spec errors are for the spec views, not this request
+                try:
+                    self.warmup()
+                except Exception:
+                    logging.exception('flasgger warmup failure')
+
+    def warmup(self, background=False):
+        """
+        Builds and serializes every configured spec, the schema registry
+        used by `validate` (when a view uses it and the specs are not
+        served from snapshots) and, with `parse`, the parsers of every
+        route, so that no request pays for it.
+        Call it once all the views are registered, e.g. at the end of the
+        wsgi module, or set the `warmup` config to do it on first request.
+
+        :param background: build in a daemon thread, which is returned
+        """
+        if background:
+            def target():
+                try:
+                    self.warmup()
+                except Exception:
+                    logging.exception('flasgger warmup failure')
+
+            thread = threading.Thread(target=target, name='flasgger-warmup')
+            thread.daemon = True
+            thread.start()
+            return thread
+
+        with self.app.app_context():
+            for spec in self.config['specs']:
+                # specs holding LazyStrings are only encoded in requests
+                if not has_lazy_strings(self.get_apispecs(spec['endpoint'])):
+                    self.get_serialized_apispecs(spec['endpoint'])
+            # the registry parses every view, which snapshots are meant to
+            # avoid: with them it is left to the first validated request
+            snapshots = not self.app.debug and all(
+                self.get_snapshot_path(spec['endpoint'])
+                for spec in self.config['specs'])
+            if self.schema_registry is None and self.validated_views \
+                    and not snapshots:
+                self.schema_registry = build_schema_registry(self)
+            if self.parse:
+                for rule in self.app.url_map.iter_rules():
+                    for method in rule.methods:
+                        key = (rule.endpoint, rule.rule, method)
+                        if key not in self.parse_index:
+                            self.parse_index[key] = self.get_request_parsing(
+                                rule, method)
+
     def parse_request(self, app):
         @app.before_request
         def before_request():  # noqa
@@ -710,44 +1266,18 @@ class Swagger(object):
             Parse and validate request data(query, form, header and body),
             set data to `request.parsed_data`
             """
-            # convert "/api/items/<int:id>/" to "/api/items/{id}/"
-            subs = []
-            for sub in str(request.url_rule).split('/'):
-                if '<' in sub:
-                    if ':' in sub:
-                        start = sub.index(':') + 1
-                    else:
-                        start = 1
-                    subs.append('{{{:s}}}'.format(sub[start:-1]))
-                else:
-                    subs.append(sub)
-            path = '/'.join(subs)
-            path_key = path + request.method.lower()
-
-            if not self.app.debug and path_key in self.parsers:
-                parsers = self.parsers[path_key]
-                schemas = self.schemas[path_key]
+            rule = request.url_rule
+            if rule is None:
+                return
+            key = (rule.endpoint, rule.rule, request.method)
+            if not self.app.debug and key in self.parse_index:
+                parsing = self.parse_index[key]
             else:
-                doc = None
-                definitions = None
-                for spec in self.config['specs']:
-                    apispec = self.get_apispecs(endpoint=spec['endpoint'])
-                    if path in apispec['paths']:
-                        if request.method.lower() in apispec['paths'][path]:
-                            doc = apispec['paths'][path][
-                                request.method.lower()]
-                            definitions = extract_schema(apispec)
-                            break
-                if not doc:
-                    return
-
-                parsers = defaultdict(RequestParser)
-                schemas = defaultdict(
-                    lambda: {'type': 'object', 'properties': defaultdict(dict)}
-                )
-                self.update_schemas_parsers(doc, schemas, parsers, definitions)
-                self.schemas[path_key] = schemas
-                self.parsers[path_key] = parsers
+                parsing = self.parse_index[key] = self.get_request_parsing(
+                    rule, request.method)
+            if parsing is None:
+                return
+            parsers, schemas, validators = parsing
 
             parsed_data = {'path': request.view_args}
             for location in parsers.keys():
@@ -755,14 +1285,59 @@ class Swagger(object):
             if 'json' in schemas:
                 parsed_data['json'] = request.json or {}
             for location, data in parsed_data.items():
+                schema = schemas[location]
+                validation_function = self.validation_function
+                if validation_function is self.default_validation_function:
+                    validator = validators.get(location)
+                    if validator is None:
+                        validator = validators[location] = CompiledSchema(
+                            schema, format_checker=self.format_checker)
+                    validation_function = validator.validate
                 try:
-                    ret = self.validation_function(data, schemas[location])
-                    print(ret)
+                    validation_function(data, schema)
                 except jsonschema.ValidationError as e:
-                    self.validation_error_handler(e, data, schemas[location])
+                    self.validation_error_handler(e, data, schema)
 
             setattr(request, 'parsed_data', parsed_data)
 
+    def get_request_parsing(self, rule, method):
+        """
+        Returns the (parsers, schemas, validators) used to parse and
+        validate requests to rule with method, None if no spec documents it.
+        validators maps locations to their `CompiledSchema`, built on use.
+        """
+        # convert "/api/items/<int:id>/" to "/api/items/{id}/"
+        subs = []
+        for sub in str(rule).split('/'):
+            if '<' in sub:
+                if ':' in sub:
+                    start = sub.index(':') + 1
+                else:
+                    start = 1
+                subs.append('{{{:s}}}'.format(sub[start:-1]))
+            else:
+                subs.append(sub)
+        path = '/'.join(subs)
+
+        doc = None
+        definitions = None
+        for spec in self.config['specs']:
+            apispec = self.get_apispecs(endpoint=spec['endpoint'])
+            if path in apispec['paths']:
+                if method.lower() in apispec['paths'][path]:
+                    doc = apispec['paths'][path][method.lower()]
+                    definitions = extract_schema(apispec)
+                    break
+        if not doc:
+            return None
+
+        parsers = defaultdict(RequestParser)
+        schemas = defaultdict(
+            lambda: {'type': 'object', 'properties': defaultdict(dict)}
+        )
+        self.update_schemas_parsers(doc, schemas, parsers, definitions)
+        return parsers, schemas, {}
+
     def update_schemas_parsers(self, doc, schemas, parsers, definitions):
         '''
         Schemas and parsers would be updated here from doc
@@ -826,10 +1401,19 @@ class Swagger(object):
 
     def set_schemas(self, schemas: dict, location: str,
                     definitions: dict):
+        # embed only the definitions the schema references, in a copy so
+        # the operation of the spec is left untouched
+        schema = dict(schemas[location])
         if is_openapi3(self.config.get('openapi')):
-            schemas[location]['components'] = {'schemas': dict(definitions)}
+            names = get_referenced_definitions(
+                schema, definitions, '#/components/schemas/')
+            schema['components'] = {
+                'schemas': {name: definitions[name] for name in names}}
         else:
-            schemas[location]['definitions'] = dict(definitions)
+            names = get_referenced_definitions(schema, definitions)
+            schema['definitions'] = {
+                name: definitions[name] for name in names}
+        schemas[location] = schema
 
     def validate(
             self, schema_id, validation_function=None,
@@ -872,13 +1456,21 @@ class Swagger(object):
         if validation_error_handler is None:
             validation_error_handler = self.validation_error_handler
 
+        self.validated_views = True
+
         def decorator(func):
             @wraps(func)
             def wrapper(*args, **kwargs):
-                specs = get_schema_specs(schema_id, self)
+                # the default validation function is served by the
+                # validator prebuilt along with the compiled schema
+                if validation_function is self.default_validation_function:
+                    _validation_function = None
+                else:
+                    _validation_function = validation_function
                 validate(
-                    schema_id=schema_id, specs=specs,
-                    validation_function=validation_function,
+                    schema_id=schema_id,
+                    compiled_schema=self.get_compiled_schema(schema_id),
+                    validation_function=_validation_function,
                     validation_error_handler=validation_error_handler,
                     openapi_version=self.config.get('openapi')
                 )
@@ -888,6 +1480,36 @@ class Swagger(object):
 
         return decorator
 
+    def get_schema_specs(self, schema_id):
+        """
+        Returns the specs of the view declaring :param schema_id:, or None.
+        The lookup registry is built on first use and rebuilt on every
+        call in debug mode, as `get_apispecs` does
+        """
+        if self.app.debug or self.schema_registry is None:
+            self.compiled_schemas = {}
+            self.schema_registry = build_schema_registry(self)
+        return self.schema_registry.get(schema_id.lower())
+
+    def get_compiled_schema(self, schema_id):
+        """
+        Returns the `CompiledSchema` used to validate data against
+        :param schema_id:, or None if no view declares it
+        """
+        specs = self.get_schema_specs(schema_id)
+        if specs is None:
+            return None
+        compiled = self.compiled_schemas.get(schema_id)
+        if compiled is None:
+            compiled = compile_schema(
+                copy.deepcopy(specs), schema_id,
+                openapi_version=self.config.get('openapi'),
+                format_checker=self.format_checker,
+                yaml_loader=self.config.get('yaml_loader')
+            )
+            self.compiled_schemas[schema_id] = compiled
+        return compiled
+
     def get_schema(self, schema_id):
         """
         This method finds a schema known to Flasgger and returns it.
@@ -897,7 +1519,7 @@ class Swagger(object):
 
         :param schema_id: the id of the desired schema
         """
-        schema_specs = get_schema_specs(schema_id, self)
+        schema_specs = self.get_schema_specs(schema_id)
 
         if schema_specs is None:
             raise KeyError(
@@ -1,23 +1,84 @@
+import gzip
+import itertools
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 import click
 from flask import current_app
 from flask.cli import with_appcontext
 
+from .utils import SpecsProfile
+from .utils import file_cache
 from .utils import is_openapi3
+from .utils import yaml_cache
+
+
+def dump_api_schema(spec, compact=False):
+    """Encodes spec as the JSON text written by `generate_api_schema`."""
+    if compact:
+        return json.dumps(spec, separators=(",", ":"))
+    return json.dumps(spec, indent=4)
+
+
+def write_api_schema(spec, path, compact=False, compress=False):
+    """Writes spec to path and, with compress, to path.gz. Returns the
+    paths written."""
+    data = dump_api_schema(spec, compact).encode("utf-8")
+    with open(path, "wb") as file:
+        file.write(data)
+    if not compress:
+        return [path]
+    # gzip.compress only takes mtime from python 3.8; no name nor time in
+    # the header, so the same spec gives the same bytes
+    with open(path + ".gz", "wb") as file:
+        with gzip.GzipFile(filename="", mode="wb", fileobj=file,
+                           mtime=0) as gz:
+            gz.write(data)
+    return [path, path + ".gz"]
 
 
 @click.command()
 @click.option("-f", "--file", type=click.File("w"), default="-")
 @click.option("-e", "--endpoint", default=None)
+@click.option("-a", "--all", "all_endpoints", is_flag=True,
+              help="Generate every configured spec, requires --out-dir.")
+@click.option("-o", "--out-dir", default=None,
+              type=click.Path(file_okay=False, writable=True),
+              help="Write each spec to <out-dir>/<endpoint>.json.")
+@click.option("--compact/--pretty", default=False,
+              help="Output JSON without or with indentation.")
+@click.option("-z", "--gzip", "compress", is_flag=True,
+              help="Also write <endpoint>.json.gz in --out-dir.")
+@click.option("-j", "--jobs", default=None, type=int,
+              help="Threads writing the specs of --out-dir.")
 @with_appcontext
-def generate_api_schema(file, endpoint):
+def generate_api_schema(file, endpoint, all_endpoints, out_dir, compact,
+                        compress, jobs):
     """Generate the swagger schema for your api."""
-    try:
-        if endpoint is None:
-            endpoint = current_app.swag.config["specs"][0]["endpoint"]
+    if all_endpoints and endpoint is not None:
+        raise click.UsageError("--all and --endpoint are exclusive")
+    if all_endpoints and out_dir is None:
+        raise click.UsageError("--all requires --out-dir")
+    if compress and out_dir is None:
+        raise click.UsageError("--gzip requires --out-dir")
 
-        spec = current_app.swag.get_apispecs(endpoint)
+    if all_endpoints:
+        endpoints = [
+            spec["endpoint"] for spec in current_app.swag.config["specs"]
+        ]
+    elif endpoint is None:
+        endpoints = [current_app.swag.config["specs"][0]["endpoint"]]
+    else:
+        endpoints = [endpoint]
+
+    specs = {}
+    try:
+        # built one after the other in this app context, so that the views
+        # included in several specs are parsed once
+        for endpoint in endpoints:
+            specs[endpoint] = current_app.swag.get_apispecs(
+                endpoint, snapshot=False)
     except RuntimeError as e:
         click.echo(e, err=True)
         click.echo(
@@ -34,11 +95,104 @@ def generate_api_schema(file, endpoint):
         )
         raise click.Abort
 
-    # See also: https://github.com/flasgger/flasgger/issues/267
-    if is_openapi3(spec.get("openapi")):
-        if "definitions" in spec:
-            del spec["definitions"]
+    for spec in specs.values():
+        # See also: https://github.com/flasgger/flasgger/issues/267
+        if is_openapi3(spec.get("openapi")):
+            if "definitions" in spec:
+                del spec["definitions"]
+
+    if out_dir is None:
+        spec = specs[endpoints[0]]
+        file.write(dump_api_schema(spec, compact))
+        return spec
+
+    os.makedirs(out_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        paths = list(executor.map(
+            lambda endpoint: write_api_schema(
+                specs[endpoint], os.path.join(out_dir, endpoint + ".json"),
+                compact, compress),
+            endpoints,
+        ))
+    for path in itertools.chain.from_iterable(paths):
+        click.echo(path)
+    return specs
+
+
+@click.command()
+@click.option("-e", "--endpoint", "endpoints", multiple=True)
+@with_appcontext
+def verify_api_schema(endpoints):
+    """Check the snapshots of your specs are up to date."""
+    swag = current_app.swag
+    if not endpoints:
+        endpoints = [
+            spec["endpoint"] for spec in swag.config["specs"]
+            if swag.get_snapshot_path(spec["endpoint"])
+        ]
+        if not endpoints:
+            click.echo("No snapshot configured", err=True)
+            raise click.Abort
+
+    stale = False
+    for endpoint in endpoints:
+        path = swag.get_snapshot_path(endpoint)
+        if path is None:
+            click.echo("{}: no snapshot configured".format(endpoint), err=True)
+            stale = True
+            continue
+        try:
+            with open(path) as snapshot:
+                expected = json.load(snapshot)
+        except (IOError, OSError, ValueError) as e:
+            click.echo("{}: cannot load {}: {}".format(endpoint, path, e),
+                       err=True)
+            stale = True
+            continue
+        spec = swag.get_apispecs(endpoint, snapshot=False)
+        actual = json.loads(json.dumps(spec))
+        if actual == expected:
+            click.echo("{}: {} is up to date".format(endpoint, path))
+            continue
+        stale = True
+        click.echo("{}: {} is stale".format(endpoint, path), err=True)
+        for key in sorted(set(actual) | set(expected)):
+            if key != "paths" and actual.get(key) != expected.get(key):
+                click.echo("  {} differs".format(key), err=True)
+        actual_paths = actual.get("paths", {})
+        expected_paths = expected.get("paths", {})
+        for route in sorted(set(actual_paths) | set(expected_paths)):
+            if actual_paths.get(route) != expected_paths.get(route):
+                click.echo("  paths {} differs".format(route), err=True)
+
+    if stale:
+        raise click.Abort
+
+
+@click.command()
+@click.option("-e", "--endpoint", "endpoints", multiple=True)
+@click.option("-n", "--top", default=10, type=int,
+              help="Number of slowest rules to list.")
+@with_appcontext
+def profile_api_schema(endpoints, top):
+    """Time a cold build of your specs, per phase and per rule."""
+    swag = current_app.swag
+    if not endpoints:
+        endpoints = [spec["endpoint"] for spec in swag.config["specs"]]
 
-    json.dump(spec, file, indent=4)
+    swag.specs_cache.clear()
+    file_cache.clear()
+    yaml_cache.clear()
+    with SpecsProfile() as profile:
+        for endpoint in endpoints:
+            try:
+                swag.get_apispecs(endpoint, snapshot=False)
+            except RuntimeError as e:
+                click.echo(e, err=True)
+                raise click.Abort
 
-    return spec
+    click.echo("Built {} in {:.2f} ms".format(
+        ", ".join(endpoints), profile.elapsed * 1000))
+    click.echo()
+    click.echo(profile.report(top))
+    return profile
@@ -31,10 +31,19 @@ try:
         swag_require_data = True
 
         def to_specs_dict(self):
-            specs = {'parameters': self.__class__}
+            """
+            Returns the specs of this schema, converted once per subclass
+            (and `swag_in` value) and shared: do not alter them
+            """
+            cls = self.__class__
+            cached = cls.__dict__.get('_specs_dict')
+            if cached is not None and cached[0] == cls.swag_in:
+                return cached[1]
+            specs = {'parameters': cls}
             definitions = {}
             specs.update(convert_schemas(specs, definitions))
             specs['definitions'] = definitions
+            cls._specs_dict = (cls.swag_in, specs)
             return specs
 
 except ImportError:
@@ -92,22 +101,37 @@ class SwaggerView(MethodView):
         If validation=True perform validation
         """
         if self.validation:
-            specs = {}
-            attrs = flasgger.constants.OPTIONAL_FIELDS + [
-                'parameters', 'definitions', 'responses',
-                'summary', 'description'
-            ]
-            for attr in attrs:
-                specs[attr] = getattr(self, attr)
-            definitions = {}
-            specs.update(convert_schemas(specs, definitions))
-            specs['definitions'] = definitions
             flasgger.utils.validate(
-                specs=specs, validation_function=self.validation_function,
+                specs=self.get_validation_specs(),
+                validation_function=self.validation_function,
                 validation_error_handler=self.validation_error_handler
             )
         return super(SwaggerView, self).dispatch_request(*args, **kwargs)
 
+    def get_validation_specs(self):
+        """
+        Returns the specs validating requests, converted from the view
+        attributes once and kept on the class until one of them changes.
+        Being the same object each time, `validate` reuses the schema it
+        compiled from them.
+        """
+        attrs = flasgger.constants.OPTIONAL_FIELDS + [
+            'parameters', 'definitions', 'responses',
+            'summary', 'description'
+        ]
+        values = tuple(getattr(self, attr) for attr in attrs)
+        cached = type(self).__dict__.get('_validation_specs')
+        if cached is not None and len(cached[0]) == len(values) and all(
+                a is b for a, b in zip(cached[0], values)):
+            return cached[1]
+
+        specs = dict(zip(attrs, values))
+        definitions = {}
+        specs.update(convert_schemas(specs, definitions))
+        specs['definitions'] = definitions
+        type(self)._validation_specs = (values, specs)
+        return specs
+
 
 def convert_schemas(d, definitions=None):
     """
@@ -7,6 +7,8 @@ import inspect
 import os
 import re
 import sys
+import threading
+import time
 import jsonschema
 import yaml
 from six import string_types, text_type
@@ -31,6 +33,60 @@ from .marshmallow_apispec import convert_schemas
 from .marshmallow_apispec import Schema
 
 
+class LRUCache(object):
+    """
+    A small thread safe mapping keeping the `maxsize` most recently used
+    entries
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def resize(self, maxsize):
+        """
+        Sets maxsize, dropping the least recently used entries over it.
+        A cache of size 0 keeps nothing.
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+# (source, schema_id, openapi_version) -> (specs, CompiledSchema)
+compiled_schemas = LRUCache(maxsize=256)
+
+# absolute path -> (mtime, size, decoded text)
+file_cache = LRUCache(maxsize=512)
+
+# (yaml text, loader) -> parsed object
+yaml_cache = LRUCache(maxsize=512)
+
+
 def merge_specs(target, source):
     """
     Update target dictionary with values from the source, recursively.
@@ -48,7 +104,11 @@ def merge_specs(target, source):
             target[key] = value
 
 
-def get_schema_specs(schema_id, swagger):
+def build_schema_registry(swagger):
+    """
+    Maps every lower-cased schema id declared by a parameter to the specs
+    of the first view declaring it, in a single pass over the url map
+    """
     ignore_verbs = set(
         swagger.config.get('ignore_verbs', ("HEAD", "OPTIONS")))
 
@@ -61,24 +121,253 @@ def get_schema_specs(schema_id, swagger):
     with swagger.app.app_context():
         specs = get_specs(
             current_app.url_map.iter_rules(), ignore_verbs,
-            optional_fields, swagger.sanitizer, openapi_version)
+            optional_fields, swagger.sanitizer, openapi_version,
+            cache=swagger.get_specs_cache(),
+            verify_cache=swagger.app.debug,
+            yaml_loader=swagger.config.get('yaml_loader'))
+
+    registry = {}
+    for _, verbs in specs:
+        for _, swag in verbs:
+            if swag is None:
+                continue
+            for d in swag.get('parameters', []):
+                d_schema_id = d.get('schema', {}).get('id')
+                if d_schema_id is not None:
+                    registry.setdefault(d_schema_id.lower(), swag)
+    return registry
+
+
+def get_schema_specs(schema_id, swagger):
+    return build_schema_registry(swagger).get(schema_id.lower())
+
+
+class SpecsCache(object):
+    """
+    Operation specs parsed by `get_specs`, keyed by (rule endpoint, verb)
+    along with the inputs they were parsed from: the view method, its
+    docstring and specs attributes, and the files read while parsing it
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, key, inputs, verify=True):
+        """
+        Returns the cached entry for key as a `(swag,)` tuple, or None
+        when missing or (if `verify`) parsed from inputs which changed.
+        The swag is a copy callers are free to alter.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry_inputs, files, swag = entry
+        if verify:
+            if entry_inputs != inputs:
+                return None
+            if get_files_signature(files) != files:
+                return None
+        return (deepcopy(swag),)
+
+    def set(self, key, inputs, files, swag):
+        self._entries[key] = (inputs, files, deepcopy(swag))
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
 
-        swags = (swag for _, verbs in specs for _, swag in verbs
-                 if swag is not None)
+_file_reads = threading.local()
 
-    for swag in swags:
-        for d in swag.get('parameters', []):
-            d_schema_id = d.get('schema', {}).get('id')
-            if d_schema_id is not None \
-                    and d_schema_id.lower() == schema_id.lower():
-                return swag
+
+def record_file_read(path):
+    """
+    Notes path as read by the current `get_specs` operation parsing
+    """
+    reads = getattr(_file_reads, 'paths', None)
+    if reads is not None:
+        reads.append(os.path.abspath(path))
+
+
+_profiling = threading.local()
+
+
+class SpecsProfile(object):
+    """
+    Timings of the spec builds run by the current thread while the profile
+    is active, per rule and per phase (see `profile_phase`). The time of a
+    phase run inside another one only counts for the inner phase.
+
+        with SpecsProfile() as profile:
+            swagger.get_apispecs('apispec_1', snapshot=False)
+        print(profile.report())
+    """
+
+    def __init__(self):
+        self.phases = {}  # phase -> [calls, seconds]
+        self.rules = {}  # (rule, endpoint) -> seconds
+        self.elapsed = 0.0
+        self._started = None
+        self._stack = []  # [[start, seconds of nested phases], ...]
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = getattr(_profiling, 'profile', None)
+        _profiling.profile = self
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed += time.perf_counter() - self._started
+        _profiling.profile = self._previous
+
+    def start_phase(self):
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def stop_phase(self, phase):
+        started, nested = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        entry = self.phases.setdefault(phase, [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed - nested
+        if self._stack:
+            self._stack[-1][1] += elapsed
+
+    def add_rule(self, rule, seconds):
+        key = (rule.rule, rule.endpoint)
+        self.rules[key] = self.rules.get(key, 0.0) + seconds
+
+    def report(self, top=10):
+        """
+        Returns the timings as text: the phases, slowest first, and the
+        top slowest rules
+        """
+        lines = ['{0:<24}{1:>8}{2:>12}'.format('Phase', 'Calls', 'ms')]
+        phases = sorted(
+            self.phases.items(), key=lambda item: item[1][1], reverse=True)
+        for phase, (calls, seconds) in phases:
+            lines.append('{0:<24}{1:>8}{2:>12.2f}'.format(
+                phase, calls, seconds * 1000))
+        other = self.elapsed - sum(
+            seconds for _, seconds in self.phases.values())
+        lines.append('{0:<24}{1:>8}{2:>12.2f}'.format(
+            'other', '', other * 1000))
+        lines.append('{0:<24}{1:>8}{2:>12.2f}'.format(
+            'total', '', self.elapsed * 1000))
+        lines.append('')
+        lines.append('{0:>12}  {1}'.format('ms', 'Slowest rules'))
+        rules = sorted(
+            self.rules.items(), key=lambda item: item[1], reverse=True)
+        for (rule, endpoint), seconds in rules[:top]:
+            lines.append('{0:>12.2f}  {1} ({2})'.format(
+                seconds * 1000, rule, endpoint))
+        return '\n'.join(lines)
+
+
+class _PhaseTimer(object):
+    __slots__ = ('profile', 'phase')
+
+    def __init__(self, profile, phase):
+        self.profile = profile
+        self.phase = phase
+
+    def __enter__(self):
+        self.profile.start_phase()
+
+    def __exit__(self, *exc_info):
+        self.profile.stop_phase(self.phase)
+
+
+class _NoTimer(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_no_timer = _NoTimer()
+
+
+def get_specs_profile():
+    """
+    Returns the active `SpecsProfile` of the current thread, or None
+    """
+    return getattr(_profiling, 'profile', None)
+
+
+def profile_phase(phase):
+    """
+    Returns a context manager timing phase in the active `SpecsProfile`,
+    doing nothing when there is none
+    """
+    profile = getattr(_profiling, 'profile', None)
+    if profile is None:
+        return _no_timer
+    return _PhaseTimer(profile, phase)
+
+
+def get_files_signature(files):
+    """
+    Returns ((path, mtime, size), ...) for files, or an already computed
+    signature refreshed from disk. Missing files have a None signature
+    """
+    signature = []
+    for path in files:
+        if isinstance(path, tuple):
+            path = path[0]
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+def get_operation_inputs(method, view_class, optional_fields):
+    """
+    Returns the cheap to compute inputs `get_specs` parses a view method
+    from, other than the files it reads
+    """
+    swag_paths = getattr(method, 'swag_paths', None)
+    view_class_attrs = None
+    if view_class and issubclass(view_class, SwaggerView):
+        view_class_attrs = tuple(
+            id(getattr(view_class, attr, None)) for attr in optional_fields + [
+                'parameters', 'definitions', 'responses',
+                'summary', 'description'
+            ]
+        )
+    return (
+        id(method),
+        getattr(method, '__doc__', None),
+        id(getattr(method, 'specs_dict', None)),
+        getattr(method, 'swag_path', None),
+        tuple(sorted(swag_paths.items())) if swag_paths else None,
+        view_class_attrs,
+    )
 
 
 def get_specs(rules, ignore_verbs, optional_fields, sanitizer,
-              openapi_version, doc_dir=None):
+              openapi_version, doc_dir=None, cache=None, verify_cache=True,
+              yaml_loader=None):
+    """
+    Returns [(rule, [(verb, swag), ...]), ...] for the swagged rules.
 
+    When a `SpecsCache` is given, operations found in it are not parsed
+    again; `verify_cache` re-checks their inputs (and the mtime and size of
+    the files they were parsed from) before reusing them.
+    """
+
+    profile = get_specs_profile()
     specs = []
     for rule in rules:
+        if profile is not None:
+            started = time.perf_counter()
         endpoint = current_app.view_functions[rule.endpoint]
         methods = dict()
         is_mv = is_valid_method_view(endpoint)
@@ -126,43 +415,7 @@ def get_specs(rules, ignore_verbs, optional_fields, sanitizer,
                     'Cannot detect view_func for rule {0}'.format(rule)
                 )
 
-            swag = {}
-            swag_def = {}
-
-            swagged = False
-
-            if getattr(method, 'specs_dict', None):
-                definition = {}
-                merge_specs(
-                    swag,
-                    convert_schemas(deepcopy(method.specs_dict), definition)
-                )
-                swag_def = definition
-                swagged = True
-
             view_class = getattr(endpoint, 'view_class', None)
-            if view_class and issubclass(view_class, SwaggerView):
-                apispec_swag = {}
-
-                # Don't need to alter definitions here
-                # Since it only stays in apispec_attrs
-                apispec_attrs = optional_fields + [
-                    'parameters', 'definitions', 'responses',
-                    'summary', 'description'
-                ]
-                for attr in apispec_attrs:
-                    value = getattr(view_class, attr)
-                    if value:
-                        apispec_swag[attr] = value
-                # Don't need to change 'definitions' here
-                # Since it would be appended later according to openapi
-                apispec_definitions = apispec_swag.get('definitions', {})
-                swag.update(
-                    convert_schemas(apispec_swag, apispec_definitions)
-                )
-                swag_def = apispec_definitions
-
-                swagged = True
 
             if doc_dir:
                 if view_class:
@@ -177,33 +430,111 @@ def get_specs(rules, ignore_verbs, optional_fields, sanitizer,
                     setattr(func, 'swag_type', 'yml')
                     setattr(func, 'swag_path', file_path)
 
-            doc_summary, doc_description, doc_swag = parse_docstring(
-                method, sanitizer, endpoint=rule.endpoint, verb=verb)
-
-            if is_openapi3(openapi_version):
-                swag.setdefault('components', {})['schemas'] = swag_def
-            else:  # openapi2
-                swag['definitions'] = swag_def
-
-            if doc_swag:
-                merge_specs(swag, doc_swag)
-                swagged = True
-
-            if swagged:
-                if doc_summary:
-                    swag['summary'] = doc_summary
-
-                if doc_description:
-                    swag['description'] = doc_description
+            if cache is not None:
+                cache_key = (rule.endpoint, verb, openapi_version, doc_dir,
+                             id(sanitizer), tuple(optional_fields))
+                inputs = get_operation_inputs(
+                    method, view_class, optional_fields)
+                cached = cache.get(cache_key, inputs, verify=verify_cache)
+                if cached is not None:
+                    swag, = cached
+                    if swag is not None:
+                        verbs.append((verb, swag))
+                    continue
+                _file_reads.paths = []
 
+            try:
+                swag = get_operation_specs(
+                    rule, verb, method, view_class, optional_fields,
+                    sanitizer, openapi_version, yaml_loader=yaml_loader)
+            finally:
+                if cache is not None:
+                    files = _file_reads.paths
+                    _file_reads.paths = None
+
+            if cache is not None:
+                cache.set(cache_key, inputs,
+                          get_files_signature(files), swag)
+
+            if swag is not None:
                 verbs.append((verb, swag))
 
         if verbs:
             specs.append((rule, verbs))
+        if profile is not None:
+            profile.add_rule(rule, time.perf_counter() - started)
 
     return specs
 
 
+def get_operation_specs(rule, verb, method, view_class, optional_fields,
+                        sanitizer, openapi_version, yaml_loader=None):
+    """
+    Parses the swag of a single view method, None if it is not swagged
+    """
+    swag = {}
+    swag_def = {}
+
+    swagged = False
+
+    if getattr(method, 'specs_dict', None):
+        definition = {}
+        with profile_phase('convert_schemas'):
+            converted = convert_schemas(deepcopy(method.specs_dict),
+                                        definition)
+        merge_specs(swag, converted)
+        swag_def = definition
+        swagged = True
+
+    if view_class and issubclass(view_class, SwaggerView):
+        apispec_swag = {}
+
+        # Don't need to alter definitions here
+        # Since it only stays in apispec_attrs
+        apispec_attrs = optional_fields + [
+            'parameters', 'definitions', 'responses',
+            'summary', 'description'
+        ]
+        for attr in apispec_attrs:
+            value = getattr(view_class, attr)
+            if value:
+                apispec_swag[attr] = value
+        # Don't need to change 'definitions' here
+        # Since it would be appended later according to openapi
+        apispec_definitions = apispec_swag.get('definitions', {})
+        with profile_phase('convert_schemas'):
+            swag.update(
+                convert_schemas(apispec_swag, apispec_definitions)
+            )
+        swag_def = apispec_definitions
+
+        swagged = True
+
+    doc_summary, doc_description, doc_swag = parse_docstring(
+        method, sanitizer, endpoint=rule.endpoint, verb=verb,
+        yaml_loader=yaml_loader)
+
+    if is_openapi3(openapi_version):
+        swag.setdefault('components', {})['schemas'] = swag_def
+    else:  # openapi2
+        swag['definitions'] = swag_def
+
+    if doc_swag:
+        merge_specs(swag, doc_swag)
+        swagged = True
+
+    if not swagged:
+        return None
+
+    if doc_summary:
+        swag['summary'] = doc_summary
+
+    if doc_description:
+        swag['description'] = doc_description
+
+    return swag
+
+
 def swag_from(
         specs=None, filetype=None, endpoint=None, methods=None,
         validation=False, schema_id=None, data=None, definition=None,
@@ -308,19 +639,22 @@ def swag_from(
     return decorator
 
 
-def __replace_ref(schema, relative_path, swag):
+def __replace_ref(schema, relative_path, swag, yaml_loader=None):
     """ TODO: add dev docs
 
     :param schema:
     :param relative_path:
     :param swag:
+    :param yaml_loader: loader of the referenced YAML files, see
+        `get_yaml_loader`
     :return:
     """
     absolute_path = os.path.dirname(sys.argv[0])
     new_value = {}
     for key, value in schema.items():
         if isinstance(value, dict):
-            new_value[key] = __replace_ref(value, relative_path, swag)
+            new_value[key] = __replace_ref(
+                value, relative_path, swag, yaml_loader)
         elif key == '$ref':
             # see:
             # https://swagger.io/docs/specification/describing-request-body/
@@ -328,7 +662,8 @@ def __replace_ref(schema, relative_path, swag):
                 content = swag
                 for id in value.split('/')[1:]:
                     content = content[id]
-                return __replace_ref(content, relative_path, swag) \
+                return __replace_ref(
+                    content, relative_path, swag, yaml_loader) \
                     if isinstance(content, dict) else content
 
             if len(value) > 0 and value[0] == '/':
@@ -336,26 +671,121 @@ def __replace_ref(schema, relative_path, swag):
             else:
                 file_ref_path = relative_path + '/' + value
             relative_path = os.path.dirname(file_ref_path)
-            with open(file_ref_path) as file:
-                file_content = file.read()
-                comment_index = file_content.rfind('---')
-                if comment_index > 0:
-                    comment_index = comment_index + 3
-                else:
-                    comment_index = 0
-                content = yaml.safe_load((file_content[comment_index:]))
-                new_value = content
-                if isinstance(content, dict):
-                    new_value = __replace_ref(content, relative_path, swag)
+            file_content = read_file(file_ref_path)
+            comment_index = file_content.rfind('---')
+            if comment_index > 0:
+                comment_index = comment_index + 3
+            else:
+                comment_index = 0
+            content = load_yaml(file_content[comment_index:], yaml_loader)
+            new_value = content
+            if isinstance(content, dict):
+                new_value = __replace_ref(
+                    content, relative_path, swag, yaml_loader)
         else:
             new_value[key] = value
     return new_value
 
 
+class CompiledSchema(object):
+    """
+    A validation schema with every reference resolved, along with the
+    jsonschema validator built for it, so it can be reused across requests
+    """
+
+    def __init__(self, schema, format_checker=None):
+        self.schema = schema
+        self.format_checker = format_checker
+        self._validator = None
+
+    @property
+    def validator(self):
+        """
+        The jsonschema validator, built (and the schema checked) on first
+        use so schema errors surface while validating, as they used to
+        """
+        if self._validator is None:
+            cls = jsonschema.validators.validator_for(self.schema)
+            cls.check_schema(self.schema)
+            self._validator = cls(
+                self.schema, format_checker=self.format_checker)
+        return self._validator
+
+    def validate(self, data, schema=None):
+        """
+        Same contract as `jsonschema.validate`, the `schema` argument is
+        accepted for compatibility with custom validation functions
+        """
+        error = jsonschema.exceptions.best_match(
+            self.validator.iter_errors(data))
+        if error is not None:
+            raise error
+
+
+def compile_schema(swag, schema_id=None, relative_path=None,
+                   openapi_version=None, format_checker=None,
+                   endpoint=None, verb=None, yaml_loader=None):
+    """
+    Resolves the schema `schema_id` out of the swag specs (which may be
+    mutated) and returns it as a `CompiledSchema`
+
+    :param swag: specs dict holding parameters and definitions
+    :param schema_id: The definition id to use to validate (from specs)
+    :param relative_path: folder used to resolve relative file `$ref`s
+    :param format_checker: `jsonschema.FormatChecker` for the validator
+    :param yaml_loader: loader of the YAML files referenced by `$ref`
+    """
+    params = [
+        item for item in swag.get('parameters', [])
+        if item.get('schema')
+    ]
+
+    definitions = {}
+    main_def = {}
+    raw_definitions = extract_definitions(params, endpoint=endpoint, verb=verb,
+                                          openapi_version=openapi_version)
+
+    if schema_id is None:
+        for param in params:
+            if param.get('in') == 'body':
+                schema_id = param.get('schema', {}).get('$ref')
+                if schema_id:
+                    schema_id = schema_id.split('/')[-1]
+                    break  # consider only the first
+
+    if schema_id is None:
+        # if it is still none use first raw_definition extracted
+        if raw_definitions:
+            schema_id = raw_definitions[0].get('id')
+
+    for defi in raw_definitions:
+        if defi['id'].lower() == schema_id.lower():
+            main_def = defi.copy()
+        else:
+            definitions[defi['id']] = defi
+
+    # support definitions informed in dict
+    if schema_id in extract_schema(swag):
+        main_def = extract_schema(swag).get(schema_id)
+
+    # Doensn't need to alter 'definitions' according to open api
+    # Since it main_def exists only in this function
+    main_def['definitions'] = definitions
+
+    for key, value in definitions.items():
+        if 'id' in value:
+            del value['id']
+
+    if relative_path is None:
+        relative_path = os.path.dirname(sys.argv[0])
+    main_def = __replace_ref(main_def, relative_path, swag, yaml_loader)
+    return CompiledSchema(main_def, format_checker=format_checker)
+
+
 def validate(
         data=None, schema_id=None, filepath=None, root=None, definition=None,
         specs=None, validation_function=None, validation_error_handler=None,
-        require_data=True, openapi_version=None):
+        require_data=True, openapi_version=None, compiled_schema=None):
     """
     This method is available to use YAML swagger definitions file
     or specs (dict or object) to validate data against its jsonschema.
@@ -381,11 +811,16 @@ def validate(
         thrown as the first, the data being validated as the second and
         the schema being used to validate as the third argument
     :param require_data: is the data param required?
+    :param compiled_schema: an already resolved `CompiledSchema`, when
+        given `filepath` and `specs` are not loaded again
+
+    Schemas resolved from `filepath` or `specs` are cached (by path, or by
+    identity of the specs object) unless the app runs in debug mode.
     """
     schema_id = schema_id or definition
 
     # for backwards compatibility with function signature
-    if filepath is None and specs is None:
+    if filepath is None and specs is None and compiled_schema is None:
         abort(Response('Filepath or specs is needed to validate', status=500))
 
     if data is None:
@@ -397,80 +832,54 @@ def validate(
     if not data and require_data:
         abort(Response('No data to validate', status=400))
 
-    # not used anymore but kept to reuse with marshmallow
-    endpoint = request.endpoint.lower().replace('.', '_')
-    verb = request.method.lower()
+    if compiled_schema is None:
+        # not used anymore but kept to reuse with marshmallow
+        endpoint = request.endpoint.lower().replace('.', '_')
+        verb = request.method.lower()
+        yaml_loader = get_current_yaml_loader()
 
-    if filepath is not None:
-        if not root:
-            try:
-                frame_info = inspect.stack()[1]
-                root = os.path.dirname(os.path.abspath(frame_info[1]))
-            except Exception:
-                root = None
+        if filepath is not None:
+            if filepath.startswith('/'):
+                final_filepath = filepath
+            else:
+                if root:
+                    root = os.path.dirname(root)
+                else:
+                    root = get_caller_root_path()
+                final_filepath = os.path.join(root, filepath)
+            cache_key = ('file', final_filepath, schema_id, openapi_version,
+                         yaml_loader)
         else:
-            root = os.path.dirname(root)
-
-        if not filepath.startswith('/'):
-            final_filepath = os.path.join(root, filepath)
+            # the specs object is kept in the cache entry, so its id can
+            # not be reused by another object while the entry lives
+            cache_key = ('specs', id(specs), schema_id, openapi_version,
+                         yaml_loader)
+
+        cached = None if current_app.debug else compiled_schemas.get(cache_key)
+        if cached is not None and cached[0] is specs:
+            compiled_schema = cached[1]
         else:
-            final_filepath = filepath
-        full_doc = load_from_file(final_filepath)
-        yaml_start = full_doc.find('---')
-        swag = yaml.safe_load(full_doc[yaml_start if yaml_start >= 0 else 0:])
-    else:
-        swag = copy.deepcopy(specs)
-
-    params = [
-        item for item in swag.get('parameters', [])
-        if item.get('schema')
-    ]
-
-    definitions = {}
-    main_def = {}
-    raw_definitions = extract_definitions(params, endpoint=endpoint, verb=verb,
-                                          openapi_version=openapi_version)
-
-    if schema_id is None:
-        for param in params:
-            if param.get('in') == 'body':
-                schema_id = param.get('schema', {}).get('$ref')
-                if schema_id:
-                    schema_id = schema_id.split('/')[-1]
-                    break  # consider only the first
-
-    if schema_id is None:
-        # if it is still none use first raw_definition extracted
-        if raw_definitions:
-            schema_id = raw_definitions[0].get('id')
-
-    for defi in raw_definitions:
-        if defi['id'].lower() == schema_id.lower():
-            main_def = defi.copy()
-        else:
-            definitions[defi['id']] = defi
+            if filepath is not None:
+                full_doc = load_from_file(final_filepath)
+                yaml_start = full_doc.find('---')
+                swag = load_yaml(
+                    full_doc[yaml_start if yaml_start >= 0 else 0:],
+                    yaml_loader)
+                relative_path = os.path.dirname(filepath)
+            else:
+                swag = copy.deepcopy(specs)
+                relative_path = None
 
-    # support definitions informed in dict
-    if schema_id in extract_schema(swag):
-        main_def = extract_schema(swag).get(schema_id)
+            compiled_schema = compile_schema(
+                swag, schema_id, relative_path=relative_path,
+                openapi_version=openapi_version, endpoint=endpoint, verb=verb,
+                yaml_loader=yaml_loader)
+            compiled_schemas.set(cache_key, (specs, compiled_schema))
 
-    # Doensn't need to alter 'definitions' according to open api
-    # Since it main_def exists only in this function
-    main_def['definitions'] = definitions
-
-    for key, value in definitions.items():
-        if 'id' in value:
-            del value['id']
+    main_def = compiled_schema.schema
 
     if validation_function is None:
-        validation_function = jsonschema.validate
-
-    absolute_path = os.path.dirname(sys.argv[0])
-    if filepath is None:
-        relative_path = absolute_path
-    else:
-        relative_path = os.path.dirname(filepath)
-    main_def = __replace_ref(main_def, relative_path, swag)
+        validation_function = compiled_schema.validate
 
     try:
         validation_function(data, main_def)
@@ -481,6 +890,22 @@ def validate(
             abort(Response(str(err), status=400))
 
 
+def get_caller_root_path(depth=2):
+    """
+    Returns the folder of the file calling the function that calls this
+    one, reading only that frame (`inspect.stack()` would build every frame
+    along with its source context)
+    """
+    try:
+        frame = sys._getframe(depth)
+    except (AttributeError, ValueError):
+        return None
+    try:
+        return os.path.dirname(os.path.abspath(frame.f_code.co_filename))
+    finally:
+        del frame
+
+
 def apispec_to_template(app, spec, definitions=None, paths=None):
     """
     Converts apispec object in to flasgger definitions template
@@ -578,18 +1003,14 @@ def load_from_file(swag_path, swag_type='yml', root_path=None):
         # TODO: support JSON
 
     try:
-        enc = detect_by_bom(swag_path)
-        with codecs.open(swag_path, encoding=enc) as yaml_file:
-            return yaml_file.read()
+        return read_file(swag_path)
     except IOError:
         # not in the same dir, add dirname
         swag_path = os.path.join(
             root_path or os.path.dirname(__file__), swag_path
         )
         try:
-            enc = detect_by_bom(swag_path)
-            with codecs.open(swag_path, encoding=enc) as yaml_file:
-                return yaml_file.read()
+            return read_file(swag_path)
         except IOError:  # pragma: no cover
             # if package dir
             # see https://github.com/rochacbruno/flasgger/pull/104
@@ -608,13 +1029,87 @@ def load_from_file(swag_path, swag_type='yml', root_path=None):
             else:
                 raise RuntimeError("Package does not have origin")
             swag_path = os.path.join(site_package, os.sep.join(path[1:]))
-            with open(swag_path) as yaml_file:
-                return yaml_file.read()
+            return read_file(swag_path)
+
+
+def read_file(path):
+    """
+    Returns the text of path, decoded according to its BOM (utf-8 by
+    default). The text is kept in `file_cache` while the file modification
+    time and size are unchanged.
+    """
+    with profile_phase('file_io'):
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        record_file_read(path)
+        cached = file_cache.get(path)
+        if cached is not None and \
+                cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        with open(path, 'rb') as f:
+            raw = f.read()
+        text = codecs.decode(raw, detect_encoding(raw))
+        file_cache.set(path, (stat.st_mtime_ns, stat.st_size, text))
+        return text
+
+
+def get_yaml_loader(loader=None):
+    """
+    Returns the YAML loader class for a `yaml_loader` config value:
+    None or 'auto' picks libyaml's `CSafeLoader` when PyYAML was built
+    with it and the pure python `SafeLoader` otherwise, 'c' and 'python'
+    force one of them and a loader class is used as is
+    """
+    if loader is None or loader == 'auto':
+        return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    if loader == 'python':
+        return yaml.SafeLoader
+    if loader == 'c':
+        if not getattr(yaml, '__with_libyaml__', False):
+            raise RuntimeError('PyYAML was built without libyaml')
+        return yaml.CSafeLoader
+    return loader
+
+
+def get_current_yaml_loader():
+    """
+    Returns the `yaml_loader` config of the Swagger of the current app,
+    None (the default loader) when it has none
+    """
+    swag = getattr(current_app, 'swag', None)
+    if swag is None:
+        return None
+    return swag.config.get('yaml_loader')
+
+
+def load_yaml(text, loader=None):
+    """
+    Safe loads a YAML document with loader (see `get_yaml_loader`),
+    memoized in `yaml_cache` so a document shared by many views is parsed
+    once, unless its size is 0. Returns a copy callers are free to alter.
+    """
+    with profile_phase('yaml'):
+        loader = get_yaml_loader(loader)
+        if not yaml_cache.maxsize:
+            return yaml.load(text, Loader=loader)
+        key = (text, loader)
+        parsed = yaml_cache.get(key)
+        if parsed is None:
+            parsed = yaml.load(text, Loader=loader)
+            yaml_cache.set(key, parsed)
+        return deepcopy(parsed)
 
 
 def detect_by_bom(path, default='utf-8'):
     with open(path, 'rb') as f:
         raw = f.read(4)  # will read less if the file is smaller
+    return detect_encoding(raw, default)
+
+
+def detect_encoding(raw, default='utf-8'):
+    """
+    Returns the encoding announced by the BOM of raw bytes, or default
+    """
     for enc, boms in \
             ('utf-8-sig', (codecs.BOM_UTF8,)),\
             ('utf-16', (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)),\
@@ -624,7 +1119,8 @@ def detect_by_bom(path, default='utf-8'):
     return default
 
 
-def parse_docstring(obj, process_doc, endpoint=None, verb=None):
+def parse_docstring(obj, process_doc, endpoint=None, verb=None,
+                    yaml_loader=None):
     """
     Gets swag data for method/view docstring
     """
@@ -661,21 +1157,23 @@ def parse_docstring(obj, process_doc, endpoint=None, verb=None):
             full_doc = load_from_file(doc_filepath, swag_type)
             from_file = True
 
-        full_doc = parse_imports(full_doc, root_path)
+        with profile_phase('parse_imports'):
+            full_doc = parse_imports(full_doc, root_path)
 
         yaml_sep = full_doc.find('---')
 
         if yaml_sep != -1:
             line_feed = full_doc.find('\n')
             if line_feed != -1:
-                first_line = process_doc(full_doc[:line_feed])
-                other_lines = process_doc(
-                    full_doc[line_feed + 1: yaml_sep]
-                )
-                swag = yaml.safe_load(full_doc[yaml_sep + 4:])
+                with profile_phase('sanitizer'):
+                    first_line = process_doc(full_doc[:line_feed])
+                    other_lines = process_doc(
+                        full_doc[line_feed + 1: yaml_sep]
+                    )
+                swag = load_yaml(full_doc[yaml_sep + 4:], yaml_loader)
         else:
             if from_file:
-                swag = yaml.safe_load(full_doc)
+                swag = load_yaml(full_doc, yaml_loader)
             else:
                 first_line = full_doc
 
@@ -696,7 +1194,7 @@ def get_root_path(obj):
     return os.path.dirname(filename)
 
 
-def parse_definition_docstring(obj, process_doc):
+def parse_definition_docstring(obj, process_doc, yaml_loader=None):
     """
     Gets swag data from docstring for class based definitions
     """
@@ -725,7 +1223,7 @@ def parse_definition_docstring(obj, process_doc):
             doc_lines = process_doc(
                 full_doc[:yaml_sep - 1]
             ) if yaml_sep else None
-            swag = yaml.safe_load(full_doc[yaml_sep:])
+            swag = load_yaml(full_doc[yaml_sep:], yaml_loader)
         else:
             doc_lines = process_doc(full_doc)
 
@@ -762,6 +1260,11 @@ def extract_definitions(alist, level=None, endpoint=None, verb=None,
     We require an 'id' field for the schema to be correctly
     added to the definitions list.
     """
+    if level is None:
+        with profile_phase('extract_definitions'):
+            return extract_definitions(alist, 0, endpoint, verb,
+                                       prefix_ids, openapi_version)
+
     endpoint = endpoint or request.endpoint.lower()
     verb = verb or request.method.lower()
     endpoint = endpoint.replace('.', '_')
@@ -780,10 +1283,6 @@ def extract_definitions(alist, level=None, endpoint=None, verb=None,
                 openapi_version)
         return ret
 
-    # for tracking level of recursion
-    if level is None:
-        level = 0
-
     defs = list()
     for item in alist:
         if not getattr(item, 'get'):
@@ -972,6 +1471,104 @@ class CachedLazyString(LazyString):
         return self._cache
 
 
+def get_referenced_definitions(obj, definitions,
+                               ref_prefix='#/definitions/'):
+    """
+    Returns the names of the definitions obj references through `$ref`s
+    starting with ref_prefix, directly or through other definitions
+    """
+    names = set()
+    pending = [obj]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, dict):
+            ref = node.get('$ref')
+            if isinstance(ref, string_types) and ref.startswith(ref_prefix):
+                name = ref[len(ref_prefix):].split('/')[0]
+                name = name.replace('~1', '/').replace('~0', '~')
+                if name not in names and name in definitions:
+                    names.add(name)
+                    pending.append(definitions[name])
+            pending.extend(node.values())
+        elif isinstance(node, (list, tuple)):
+            pending.extend(node)
+    return names
+
+
+def split_apispecs(spec, untagged='default'):
+    """
+    Splits a spec by operation tag. Returns {tag: part} where each part is
+    the spec restricted to the operations having tag (`untagged` for those
+    without tags) and to the definitions they reference.
+    """
+    groups = OrderedDict()
+    for path, path_item in spec.get('paths', {}).items():
+        for verb, operation in path_item.items():
+            if not isinstance(operation, dict):
+                continue
+            for tag in operation.get('tags') or [untagged]:
+                group = groups.setdefault(tag, OrderedDict())
+                group.setdefault(path, {})[verb] = operation
+
+    parts = OrderedDict()
+    for tag, paths in groups.items():
+        part = {
+            key: value for key, value in spec.items()
+            if key not in ('paths', 'tags')
+        }
+        part['paths'] = paths
+        prune_definitions(part)
+        if 'tags' in spec:
+            part['tags'] = [
+                item for item in spec['tags'] if item.get('name') == tag]
+        parts[tag] = part
+    return parts
+
+
+def prune_definitions(spec):
+    """
+    Drops from spec the definitions (openapi 3 component schemas) its
+    paths do not reference, directly or through other definitions. Only
+    the spec itself is altered: dicts it shares are replaced, not pruned.
+    """
+    if is_openapi3(spec.get('openapi')):
+        components = dict(spec.get('components', {}))
+        schemas = components.get('schemas', {})
+        names = get_referenced_definitions(
+            [spec.get('paths'), [value for key, value in components.items()
+                                 if key != 'schemas']],
+            schemas, '#/components/schemas/')
+        components['schemas'] = {
+            name: value for name, value in schemas.items() if name in names
+        }
+        spec['components'] = components
+        spec.pop('definitions', None)
+    else:
+        definitions = spec.get('definitions', {})
+        names = get_referenced_definitions(
+            [spec.get('paths'), spec.get('parameters'),
+             spec.get('responses')],
+            definitions)
+        spec['definitions'] = {
+            name: value for name, value in definitions.items()
+            if name in names
+        }
+    return spec
+
+
+def has_lazy_strings(obj):
+    """
+    Returns True if obj holds `LazyString`s evaluated on every use
+    """
+    if isinstance(obj, LazyString):
+        return not isinstance(obj, CachedLazyString)
+    if isinstance(obj, dict):
+        return any(has_lazy_strings(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(has_lazy_strings(value) for value in obj)
+    return False
+
+
 def swag_annotation(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
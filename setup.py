@@ -41,6 +41,7 @@ setup(
     packages=find_packages(
         exclude=[
             'tests', 'tests.*',
+            'benchmarks', 'benchmarks.*',
             'examples', 'examples.*',
             'demo_app', 'demo_app.*',
             'etc', 'etc.*'
@@ -65,6 +66,8 @@ setup(
     entry_points={
         'flask.commands': [
             'generate-api-schema=flasgger.commands:generate_api_schema',
+            'verify-api-schema=flasgger.commands:verify_api_schema',
+            'flasgger-profile=flasgger.commands:profile_api_schema',
         ],
     },
 )
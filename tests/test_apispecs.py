@@ -3,6 +3,7 @@ import pytest
 import sys
 import flasgger
 import flask
+import gzip
 import json
 from collections import defaultdict
 
@@ -20,3 +21,195 @@ def test_client():
         specs = flasgger.base.APISpecsView(loader=lambda: {'test': 'test'})
         assert specs.get() != None
     flask.json._json = json
+
+
+def test_specs_etag():
+    app = flask.Flask('test-app')
+    swag = flasgger.Swagger(app)
+    client = app.test_client()
+
+    response = client.get('/apispec_1.json')
+    assert response.status_code == 200
+    etag, _ = response.get_etag()
+    assert etag
+    assert response.last_modified is not None
+    assert json.loads(response.data) == swag.get_apispecs()
+
+    response = client.get('/apispec_1.json',
+                          headers={'If-None-Match': '"{}"'.format(etag)})
+    assert response.status_code == 304
+    assert not response.data
+
+    # encoded once while the spec is not rebuilt
+    serialized = swag.serialized_apispecs['apispec_1']
+    client.get('/apispec_1.json')
+    assert swag.serialized_apispecs['apispec_1'] is serialized
+
+    swag.apispecs.clear()
+    response = client.get('/apispec_1.json',
+                          headers={'If-None-Match': '"{}"'.format(etag)})
+    assert response.status_code == 304
+    assert swag.serialized_apispecs['apispec_1'] is not serialized
+
+
+def test_specs_compression():
+    app = flask.Flask('test-app')
+    app.config['SWAGGER'] = {'compress_specs': True}
+    swag = flasgger.Swagger(app)
+    client = app.test_client()
+    with app.app_context():
+        spec = swag.get_apispecs()
+
+    response = client.get('/apispec_1.json',
+                          headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert json.loads(gzip.decompress(response.data)) == spec
+
+    response = client.get('/apispec_1.json')
+    assert 'Content-Encoding' not in response.headers
+    assert json.loads(response.data) == spec
+
+    if flasgger.base.brotli is not None:
+        response = client.get('/apispec_1.json',
+                              headers={'Accept-Encoding': 'gzip, br'})
+        assert response.headers['Content-Encoding'] == 'br'
+        assert json.loads(flasgger.base.brotli.decompress(
+            response.data)) == spec
+
+
+def test_specs_not_compressed_in_debug_mode():
+    app = flask.Flask('test-app')
+    app.debug = True
+    app.config['SWAGGER'] = {'compress_specs': True}
+    flasgger.Swagger(app)
+    client = app.test_client()
+
+    response = client.get('/apispec_1.json',
+                          headers={'Accept-Encoding': 'gzip, br'})
+    assert 'Content-Encoding' not in response.headers
+    assert json.loads(response.data)['swagger'] == '2.0'
+
+
+def test_specs_with_lazy_strings_are_encoded_per_request():
+    app = flask.Flask('test-app')
+    app.json = flasgger.LazyJSONEncoder(app)
+    template = {'host': flasgger.LazyString(lambda: flask.request.host)}
+    flasgger.Swagger(app, template=template)
+    client = app.test_client()
+
+    spec = json.loads(client.get('/apispec_1.json',
+                                 base_url='http://one.test').data)
+    assert spec['host'] == 'one.test'
+    spec = json.loads(client.get('/apispec_1.json',
+                                 base_url='http://two.test').data)
+    assert spec['host'] == 'two.test'
+
+
+def test_split_specs():
+    app = flask.Flask('test-app')
+    config = dict(flasgger.Swagger.DEFAULT_CONFIG)
+    config['specs'] = [dict(config['specs'][0], split=True)]
+    swag = flasgger.Swagger(app, config=config, template={
+        'tags': [{'name': 'cats', 'description': 'Cats!'}],
+        'definitions': {
+            'Cat': {'type': 'object',
+                    'properties': {'toy': {'$ref': '#/definitions/Toy'}}},
+            'Toy': {'type': 'object'},
+            'Dog': {'type': 'object'},
+        },
+    })
+
+    @app.route('/cats')
+    def cats():
+        """
+        Cats
+        ---
+        tags: [cats]
+        responses:
+          200:
+            description: cats
+            schema:
+              $ref: '#/definitions/Cat'
+        """
+
+    @app.route('/dogs')
+    def dogs():
+        """
+        Dogs
+        ---
+        responses:
+          200:
+            description: dogs
+            schema:
+              $ref: '#/definitions/Dog'
+        """
+
+    client = app.test_client()
+    index = client.get('/apispec_1/index.json').json
+    assert index['tags'] == [
+        {'name': 'cats', 'description': 'Cats!',
+         'url': '/apispec_1/tags/cats.json', 'paths': ['/cats']},
+        {'name': 'default',
+         'url': '/apispec_1/tags/default.json', 'paths': ['/dogs']},
+    ]
+    response = client.get('/apispec_1/index.json')
+    assert client.get('/apispec_1/index.json', headers={
+        'If-None-Match': response.headers['ETag']}).status_code == 304
+    assert ('apispec_1', '__index__') in swag.serialized_apispecs
+
+    cats_part = client.get('/apispec_1/tags/cats.json').json
+    assert list(cats_part['paths']) == ['/cats']
+    assert set(cats_part['definitions']) == {'Cat', 'Toy'}
+    assert cats_part['tags'] == [{'name': 'cats', 'description': 'Cats!'}]
+    assert cats_part['info'] == client.get('/apispec_1.json').json['info']
+
+    default_part = client.get('/apispec_1/tags/default.json').json
+    assert set(default_part['definitions']) == {'Dog'}
+    assert client.get('/apispec_1/tags/birds.json').status_code == 404
+    assert ('apispec_1', 'cats') in swag.serialized_apispecs
+
+
+@pytest.mark.parametrize('openapi,prefix', [
+    ('2.0', '#/definitions/'),
+    ('3.0.2', '#/components/schemas/'),
+])
+def test_prune_definitions(openapi, prefix):
+    app = flask.Flask('test-app')
+    config = dict(flasgger.Swagger.DEFAULT_CONFIG, openapi=openapi)
+    config['specs'] = [
+        dict(config['specs'][0], prune_definitions=True,
+             rule_filter=lambda rule: rule.endpoint == 'cats'),
+    ]
+    definitions = {
+        'Cat': {'type': 'object',
+                'properties': {'toy': {'$ref': prefix + 'Toy'}}},
+        'Toy': {'type': 'object'},
+        'Dog': {'type': 'object'},
+    }
+    if openapi == '2.0':
+        template = {'definitions': definitions}
+    else:
+        template = {'components': {'schemas': definitions}}
+    swag = flasgger.Swagger(app, config=config, template=template)
+
+    @app.route('/cats')
+    @flasgger.swag_from({'responses': {200: {
+        'description': 'cats', 'schema': {'$ref': prefix + 'Cat'}}}})
+    def cats():
+        pass
+
+    @app.route('/dogs')
+    @flasgger.swag_from({'responses': {200: {
+        'description': 'dogs', 'schema': {'$ref': prefix + 'Dog'}}}})
+    def dogs():
+        pass
+
+    with app.app_context():
+        spec = swag.get_apispecs()
+    if openapi == '2.0':
+        assert set(spec['definitions']) == {'Cat', 'Toy'}
+    else:
+        assert 'definitions' not in spec
+        assert set(spec['components']['schemas']) == {'Cat', 'Toy'}
+    assert set(definitions) == {'Cat', 'Toy', 'Dog'}
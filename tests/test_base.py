@@ -1,4 +1,11 @@
+import gzip
+import json
 import pytest
+import flasgger
+import flasgger.base
+import flasgger.utils
+from flasgger import swag_from
+from flask import Flask, request
 from flasgger.base import Swagger
 
 
@@ -69,3 +76,567 @@ def test_get_apispecs_with_valid_endpoint(app):
 
     with app.app_context():
         assert swagger.get_apispecs(Swagger.DEFAULT_ENDPOINT)
+
+
+def test_validate_builds_schema_registry_once(app, monkeypatch):
+    swagger = Swagger(app)
+
+    @app.route('/cats', methods=['POST'])
+    @swagger.validate('Cat')
+    def create_cat():
+        """
+        Create a cat
+        ---
+        parameters:
+          - in: body
+            name: body
+            schema:
+              id: Cat
+              required:
+                - name
+              properties:
+                name:
+                  type: string
+        responses:
+          200:
+            description: created
+        """
+        return 'ok'
+
+    calls = []
+    build_schema_registry = flasgger.base.build_schema_registry
+
+    def counting_build_schema_registry(swag):
+        calls.append(swag)
+        return build_schema_registry(swag)
+
+    monkeypatch.setattr(flasgger.base, 'build_schema_registry',
+                        counting_build_schema_registry)
+
+    client = app.test_client()
+    assert client.post('/cats', json={'name': 'Tom'}).status_code == 200
+    assert client.post('/cats', json={'name': 1}).status_code == 400
+    assert client.post('/cats', json={'age': 2}).status_code == 400
+    assert len(calls) == 1
+    assert list(swagger.schema_registry) == ['cat']
+    assert swagger.get_schema('cat')['id'] == 'Cat'
+
+
+def test_incremental_specs_in_debug(app, monkeypatch, tmp_path):
+    app.debug = True
+    app.config['SWAGGER'] = {'incremental_specs': True}
+    swagger = Swagger(app)
+
+    spec_file = tmp_path / 'cats.yml'
+    spec_file.write_text('responses:\n  200:\n    description: cats\n')
+
+    @app.route('/cats')
+    @swag_from(str(spec_file))
+    def cats():
+        return 'ok'
+
+    @app.route('/dogs')
+    def dogs():
+        """
+        Dogs
+        ---
+        responses:
+          200:
+            description: dogs
+        """
+        return 'ok'
+
+    parsed = []
+    get_operation_specs = flasgger.utils.get_operation_specs
+
+    def counting_get_operation_specs(rule, *args, **kwargs):
+        parsed.append(rule.endpoint)
+        return get_operation_specs(rule, *args, **kwargs)
+
+    monkeypatch.setattr(flasgger.utils, 'get_operation_specs',
+                        counting_get_operation_specs)
+
+    with app.app_context():
+        spec = swagger.get_apispecs()
+        assert {'cats', 'dogs'} <= set(parsed)
+        assert spec['paths']['/cats']['get']['responses'] == {
+            '200': {'description': 'cats'}}
+
+        del parsed[:]
+        assert swagger.get_apispecs() == spec
+        assert parsed == []
+
+        spec_file.write_text('responses:\n  200:\n    description: Cats!\n')
+        spec = swagger.get_apispecs()
+        assert parsed == ['cats']
+        assert spec['paths']['/cats']['get']['responses'] == {
+            '200': {'description': 'Cats!'}}
+
+
+def test_views_parsed_once_across_specs(app, monkeypatch):
+    config = dict(Swagger.DEFAULT_CONFIG)
+    config['specs'] = [
+        {
+            'endpoint': 'public',
+            'route': '/public.json',
+            'rule_filter': lambda rule: rule.endpoint == 'cats',
+        },
+        {
+            'endpoint': 'internal',
+            'route': '/internal.json',
+            'rule_filter': lambda rule: True,
+        },
+    ]
+    swagger = Swagger(app, config=config)
+
+    @app.route('/cats')
+    def cats():
+        """
+        Cats
+        ---
+        responses:
+          200:
+            description: cats
+        """
+        return 'ok'
+
+    @app.route('/dogs')
+    def dogs():
+        """
+        Dogs
+        ---
+        responses:
+          200:
+            description: dogs
+        """
+        return 'ok'
+
+    parsed = []
+    get_operation_specs = flasgger.utils.get_operation_specs
+
+    def counting_get_operation_specs(rule, *args, **kwargs):
+        parsed.append(rule.endpoint)
+        return get_operation_specs(rule, *args, **kwargs)
+
+    monkeypatch.setattr(flasgger.utils, 'get_operation_specs',
+                        counting_get_operation_specs)
+
+    with app.app_context():
+        assert list(swagger.get_apispecs('public')['paths']) == ['/cats']
+        assert set(swagger.get_apispecs('internal')['paths']) == {
+            '/cats', '/dogs'}
+    assert parsed.count('cats') == 1
+    assert parsed.count('dogs') == 1
+
+
+@pytest.mark.parametrize('warmup', [True, 'background'])
+def test_warmup_on_first_request(app, warmup):
+    app.config['SWAGGER'] = {'warmup': warmup}
+    swagger = Swagger(app)
+
+    @app.route('/cats')
+    def cats():
+        """
+        Cats
+        ---
+        responses:
+          200:
+            description: cats
+        """
+        return 'ok'
+
+    assert swagger.apispecs == {}
+    warmups = []
+    real_warmup = swagger.warmup
+
+    def recording_warmup(background=False):
+        warmups.append(background)
+        thread = real_warmup(background)
+        if thread is not None:
+            thread.join()
+
+    swagger.warmup = recording_warmup
+    client = app.test_client()
+    client.get('/cats')
+    # the background thread warms up through swagger.warmup() too
+    assert warmups[0] == (warmup == 'background')
+    calls = len(warmups)
+    client.get('/cats')
+    assert len(warmups) == calls
+    assert '/cats' in swagger.apispecs[Swagger.DEFAULT_ENDPOINT]['paths']
+    assert Swagger.DEFAULT_ENDPOINT in swagger.serialized_apispecs
+    # no view uses swagger.validate
+    assert swagger.schema_registry is None
+
+
+def test_warmup_failure_does_not_fail_first_request(app):
+    app.config['SWAGGER'] = {'warmup': True}
+    Swagger(app)
+
+    @app.route('/cats')
+    def cats():
+        """
+        Cats
+        ---
+        responses: [
+        """
+        return 'ok'
+
+    client = app.test_client()
+    assert client.get('/cats').status_code == 200
+    assert client.get('/cats').status_code == 200
+
+
+@pytest.mark.parametrize('snapshot', [False, True])
+def test_warmup_schema_registry(app, tmp_path, snapshot):
+    swagger = Swagger(app)
+
+    @app.route('/cats', methods=['POST'])
+    @swagger.validate('Cat')
+    def cats():
+        """
+        Cats
+        ---
+        parameters:
+          - name: body
+            in: body
+            schema:
+              id: Cat
+              type: object
+        responses:
+          200:
+            description: cats
+        """
+        return 'ok'
+
+    if snapshot:
+        with app.app_context():
+            spec = swagger.get_apispecs()
+        path = tmp_path / 'spec.json'
+        path.write_text(json.dumps(spec))
+        swagger.snapshot = str(path)
+        swagger.apispecs.clear()
+
+    swagger.warmup()
+    if snapshot:
+        assert swagger.schema_registry is None
+    else:
+        assert set(swagger.schema_registry) == {'cat'}
+    response = app.test_client().post('/cats', json={'name': 'Tom'})
+    assert response.status_code == 200
+
+
+def test_parse_request_index(app, monkeypatch):
+    swagger = Swagger(app, parse=True)
+
+    @app.route('/cats/<int:cat_id>')
+    def cat(cat_id):
+        """
+        A cat
+        ---
+        parameters:
+          - name: cat_id
+            in: path
+            type: integer
+            required: true
+          - name: color
+            in: query
+            type: string
+            required: true
+        responses:
+          200:
+            description: a cat
+        """
+        return request.parsed_data['args']['color']
+
+    @app.route('/dogs')
+    def dogs():
+        return 'dogs'
+
+    swagger.warmup()
+
+    def fail(*args, **kwargs):
+        raise AssertionError('parsing should come from the index')
+
+    monkeypatch.setattr(swagger, 'get_request_parsing', fail)
+    client = app.test_client()
+    assert client.get('/cats/1?color=black').data == b'black'
+    assert client.get('/cats/1').status_code == 400
+    assert client.get('/dogs').data == b'dogs'
+    assert client.get('/birds').status_code == 404
+    assert swagger.parse_index[('dogs', '/dogs', 'GET')] is None
+
+
+def test_parse_request_compiled_validators(app):
+    swagger = Swagger(app, parse=True, template={
+        'definitions': {
+            'Cat': {'type': 'object', 'required': ['name'],
+                    'properties': {'owner': {'$ref': '#/definitions/Owner'}}},
+            'Owner': {'type': 'object', 'required': ['email'],
+                      'properties': {'email': {'type': 'string'}}},
+            'Dog': {'type': 'object'},
+        }
+    })
+
+    @app.route('/cats', methods=['POST'])
+    def cats():
+        """
+        Create a cat
+        ---
+        parameters:
+          - name: body
+            in: body
+            schema:
+              $ref: '#/definitions/Cat'
+        responses:
+          200:
+            description: created
+        """
+        return 'ok'
+
+    client = app.test_client()
+    assert client.post('/cats', json={'name': 'Tom'}).status_code == 200
+    assert client.post('/cats', json={'age': 1}).status_code == 400
+    assert client.post(
+        '/cats', json={'name': 'Tom', 'owner': {}}).status_code == 400
+
+    parsers, schemas, validators = swagger.parse_index[
+        ('cats', '/cats', 'POST')]
+    assert set(schemas['json']['definitions']) == {'Cat', 'Owner'}
+    assert validators['json'].schema is schemas['json']
+    with app.app_context():
+        body, = swagger.get_apispecs()['paths']['/cats']['post']['parameters']
+    assert 'definitions' not in body['schema']
+
+
+def test_fingerprinted_static_assets():
+    app = Flask(__name__)
+    # not DEFAULT_CONFIG, that examples alter
+    swag = Swagger(app, config={
+        'headers': [],
+        'specs': [{'endpoint': 'apispec_1', 'route': '/apispec_1.json'}],
+        'static_url_path': '/flasgger_static',
+        'specs_route': '/apidocs/',
+        'fingerprint_static': True,
+    })
+    client = app.test_client()
+
+    page = client.get('/apidocs/').get_data(as_text=True)
+    with app.test_request_context():
+        url = swag.get_static_url('swagger-ui-bundle.js')
+    asset = swag.get_static_asset('swagger-ui-bundle.js')
+    assert url == '/flasgger_static/_h/{0}/swagger-ui-bundle.js'.format(
+        asset.fingerprint)
+    assert url in page
+
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'immutable' in response.headers['Cache-Control']
+    assert gzip.decompress(response.data) == asset.data
+    assert client.get(url, headers={
+        'Accept-Encoding': 'gzip',
+        'If-None-Match': response.headers['ETag'],
+    }).status_code == 304
+
+    response = client.get('/flasgger_static/_h/0123/swagger-ui-bundle.js')
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith(url)
+    assert client.get('/flasgger_static/_h/0123/missing.js').status_code == 404
+
+    # plain urls of the files of subfolders still resolve
+    assert client.get('/flasgger_static/lib/jquery.min.js').status_code == 200
+    assert client.get('/flasgger_static/swagger-ui.css').status_code == 200
+
+    with app.test_request_context():
+        url = swag.get_static_url('favicon-32x32.png')
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.mimetype == 'image/png'
+    assert 'Content-Encoding' not in response.headers
+
+
+@pytest.mark.parametrize('uiversion', [2, 3])
+def test_fingerprinted_static_assets_fallback(uiversion):
+    app = Flask(__name__)
+    swag = Swagger(app, config={
+        'headers': [],
+        'specs': [{'endpoint': 'apispec_1', 'route': '/apispec_1.json'}],
+        'static_url_path': '/flasgger_static',
+        'specs_route': '/apidocs/',
+        'fingerprint_static': True,
+        'uiversion': uiversion,
+        'swagger_ui_bundle_js': '//cdn.test/swagger-ui-bundle.js',
+    })
+    client = app.test_client()
+
+    assert client.get('/apidocs/').status_code == 200
+    # overridden, so never read
+    assert 'swagger-ui-bundle.js' not in swag.static_assets
+    with app.test_request_context():
+        assert swag.get_static_url('missing.js') == \
+            '/flasgger_static/missing.js'
+        if uiversion == 2:
+            assert swag.get_static_url('lib/jquery.min.js') == \
+                '/flasgger_static/lib/jquery.min.js'
+
+
+def test_apidocs_page_cached(monkeypatch):
+    app = Flask(__name__)
+    swag = Swagger(app, config={
+        'headers': [],
+        'specs': [{'endpoint': 'apispec_1', 'route': '/apispec_1.json'}],
+        'specs_route': '/apidocs/',
+        'title': 'Cats',
+        'cache_apidocs': True,
+    })
+    renders = []
+    render = flasgger.base.APIDocsView.render
+
+    def counting_render(self, *args):
+        renders.append(self)
+        return render(self, *args)
+
+    monkeypatch.setattr(flasgger.base.APIDocsView, 'render', counting_render)
+    client = app.test_client()
+
+    response = client.get('/apidocs/')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/html'
+    assert client.get('/apidocs/').data == response.data
+    assert client.get('/apidocs/', headers={
+        'If-None-Match': response.headers['ETag']}).status_code == 304
+    assert len(renders) == 1
+
+    client.get('/apidocs/', base_url='http://other.host/')
+    assert len(renders) == 2
+
+    swag.config['title'] = 'Dogs'
+    swag.clear_apidocs_cache()
+    assert b'Dogs' in client.get('/apidocs/').data
+    assert len(renders) == 3
+
+    for i in range(100):
+        client.get('/apidocs/', base_url='http://host{0}/'.format(i))
+    assert len(swag.apidocs_pages) == swag.apidocs_pages.maxsize
+
+
+def test_apidocs_page_not_cached_by_default():
+    app = Flask(__name__)
+    swag = Swagger(app, config={
+        'headers': [],
+        'specs': [{'endpoint': 'apispec_1', 'route': '/apispec_1.json'}],
+        'specs_route': '/apidocs/',
+    })
+    client = app.test_client()
+
+    response = client.get('/apidocs/')
+    assert client.get('/apidocs/', headers={
+        'If-None-Match': response.headers['ETag']}).status_code == 304
+    assert len(swag.apidocs_pages) == 0
+
+
+@pytest.mark.parametrize('lean_ui', [False, True])
+def test_lean_ui(lean_ui):
+    app = Flask(__name__)
+    Swagger(app, config={
+        'headers': [],
+        'specs': [{'endpoint': 'apispec_1', 'route': '/apispec_1.json'}],
+        'specs_route': '/apidocs/',
+        'lean_ui': lean_ui,
+    })
+
+    page = app.test_client().get('/apidocs/').get_data(as_text=True)
+
+    assert ('jquery.min.js' in page) is not lean_ui
+    assert ('fonts.googleapis.com' in page) is not lean_ui
+    assert '$(' not in page
+
+
+def test_fonts_css():
+    app = Flask(__name__)
+    Swagger(app, config={
+        'headers': [],
+        'specs': [{'endpoint': 'apispec_1', 'route': '/apispec_1.json'}],
+        'specs_route': '/apidocs/',
+        'fonts_css': '/static/fonts.css',
+    })
+
+    page = app.test_client().get('/apidocs/').get_data(as_text=True)
+
+    assert '<link href="/static/fonts.css" rel="stylesheet">' in page
+    assert 'fonts.googleapis.com' not in page
+
+
+def test_inline_spec():
+    app = Flask(__name__)
+    swag = Swagger(app, config={
+        'headers': [],
+        'specs': [{'endpoint': 'apispec_1', 'route': '/apispec_1.json'}],
+        'specs_route': '/apidocs/',
+        'inline_spec': True,
+    })
+
+    @app.route('/cats')
+    def cats():
+        """
+        Cats </script><script>alert(1)</script>
+        ---
+        responses:
+          200:
+            description: cats
+        """
+
+    client = app.test_client()
+    page = client.get('/apidocs/').get_data(as_text=True)
+    assert 'url: "/apispec_1.json"' not in page
+    assert '</script><script>alert' not in page
+    line, = [line for line in page.splitlines()
+             if line.strip().startswith('spec: ')]
+    inlined = json.loads(line.strip()[len('spec: '):-1])
+    assert inlined == client.get('/apispec_1.json').json
+    assert inlined['paths']['/cats']['get']['summary'].startswith(
+        'Cats </script>')
+
+    swag.config['specs'][0]['name'] = 'Cats'
+    page = client.get('/apidocs/').get_data(as_text=True)
+    assert 'spec: ' not in page
+
+
+@pytest.mark.parametrize('scope', [None, 'app'])
+def test_headers_scope(scope):
+    app = Flask(__name__)
+    config = {
+        'headers': [('X-Docs', 'yes')],
+        'specs': [{'endpoint': 'apispec_1', 'route': '/apispec_1.json'}],
+        'static_url_path': '/flasgger_static',
+        'specs_route': '/apidocs/',
+    }
+    if scope:
+        config['headers_scope'] = scope
+    Swagger(app, config=config)
+
+    @app.route('/cats')
+    def cats():
+        return 'cats'
+
+    client = app.test_client()
+    for url in ('/apispec_1.json', '/apidocs/',
+                '/flasgger_static/swagger-ui.css'):
+        assert client.get(url).headers['X-Docs'] == 'yes'
+    assert ('X-Docs' in client.get('/cats').headers) is (scope == 'app')
+
+
+def test_lazy_string_title():
+    app = Flask(__name__)
+    Swagger(app, config={
+        'headers': [],
+        'specs': [{'endpoint': 'apispec_1', 'route': '/apispec_1.json'}],
+        'specs_route': '/apidocs/',
+        'title': flasgger.LazyString(lambda: 'Lazy cats'),
+    })
+
+    response = app.test_client().get('/apidocs/')
+
+    assert response.status_code == 200
+    assert 'title.textContent = "Lazy cats";' in response.get_data(
+        as_text=True)
@@ -0,0 +1,28 @@
+import io
+
+from benchmarks.specs import STYLES, compare, run
+
+
+def test_benchmarks_run():
+    out = io.StringIO()
+
+    results = run(sizes=[10], requests=5, out=out)
+
+    assert set(results) == {'{}-10'.format(style) for style in STYLES}
+    assert len(out.getvalue().splitlines()) == len(STYLES) + 1
+    for metrics in results.values():
+        assert all(value > 0 for value in metrics.values())
+
+
+def test_benchmarks_compare():
+    baseline = {'docstring-10': {'cold': 10.0, 'spec_rps': 1000.0}}
+
+    assert compare(
+        {'docstring-10': {'cold': 11.0, 'spec_rps': 900.0}},
+        baseline, 0.25) == []
+    assert compare(
+        {'docstring-10': {'cold': 20.0, 'spec_rps': 500.0}},
+        baseline, 0.25) == [
+        'docstring-10 cold: 10.0 -> 20.0',
+        'docstring-10 spec_rps: 1000.0 -> 500.0',
+    ]
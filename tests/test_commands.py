@@ -1,7 +1,11 @@
+import gzip
 import json
 
+import pytest
+
 from flasgger.base import Swagger
-from flasgger.commands import generate_api_schema
+from flasgger.commands import generate_api_schema, verify_api_schema
+from flasgger.commands import profile_api_schema
 
 
 def test_default_specs(app, cli_runner):
@@ -49,3 +53,114 @@ def test_definitions_is_removed_for_openapi_3(app, cli_runner):
     result = cli_runner.invoke(generate_api_schema)
     assert result.exit_code == 0
     assert "definitions" not in json.loads(result.output)
+
+
+def test_snapshot(app, cli_runner, tmp_path):
+    snapshot = tmp_path / "spec.json"
+    swagger = Swagger(app, snapshot=str(snapshot))
+    spec = swagger.config["specs"][0]
+
+    @app.route("/cats")
+    def cats():
+        """
+        Cats
+        ---
+        responses:
+          200:
+            description: cats
+        """
+
+    result = cli_runner.invoke(generate_api_schema, ["-f", str(snapshot)])
+    assert result.exit_code == 0
+    result = cli_runner.invoke(verify_api_schema)
+    assert result.exit_code == 0
+    assert "up to date" in result.output
+
+    snapshot.write_text(json.dumps({"swagger": "2.0", "paths": {}}))
+    client = app.test_client()
+    assert client.get(spec["route"]).json["paths"] == {}
+
+    result = cli_runner.invoke(verify_api_schema)
+    assert result.exit_code == 1
+    assert "paths /cats differs" in result.stderr
+    with app.app_context():
+        assert swagger.get_apispecs(spec["endpoint"], snapshot=False)["paths"]
+
+
+def test_missing_snapshot(app, cli_runner, tmp_path):
+    swagger = Swagger(app, snapshot=str(tmp_path / "{endpoint}.json"))
+    spec = swagger.config["specs"][0]
+
+    assert app.test_client().get(spec["route"]).status_code == 200
+    result = cli_runner.invoke(verify_api_schema)
+    assert result.exit_code == 1
+    assert "{}: cannot load".format(spec["endpoint"]) in result.stderr
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_all_specs_out_dir(app, cli_runner, tmp_path, compact):
+    config = dict(Swagger.DEFAULT_CONFIG)
+    config["specs"] = [
+        {"endpoint": "spec_a", "route": "/spec_a.json"},
+        {"endpoint": "spec_b", "route": "/spec_b.json"},
+    ]
+    swagger = Swagger(app, config=config)
+
+    args = ["--all", "--out-dir", str(tmp_path), "--gzip"]
+    if compact:
+        args.append("--compact")
+    result = cli_runner.invoke(generate_api_schema, args)
+
+    assert result.exit_code == 0
+    for endpoint in ("spec_a", "spec_b"):
+        path = tmp_path / (endpoint + ".json")
+        assert str(path) in result.output
+        data = path.read_bytes()
+        assert json.loads(data) == swagger.get_apispecs(endpoint)
+        assert (b"\n" not in data) == compact
+        compressed = (tmp_path / (endpoint + ".json.gz")).read_bytes()
+        assert gzip.decompress(compressed) == data
+        # deterministic: no file name flag and a zero modification time
+        assert compressed[3:8] == b"\x00" * 5
+
+
+def test_all_requires_out_dir(app, cli_runner):
+    Swagger(app)
+
+    result = cli_runner.invoke(generate_api_schema, ["--all"])
+
+    assert result.exit_code == 2
+    assert "--out-dir" in result.stderr
+
+
+def test_profile(app, cli_runner):
+    swagger = Swagger(app)
+
+    @app.route("/cats/<int:cat_id>")
+    def cat(cat_id):
+        """
+        A cat
+        ---
+        parameters:
+          - name: cat_id
+            in: path
+            type: integer
+        responses:
+          200:
+            description: the cat
+            schema:
+              id: Cat
+              type: object
+        """
+
+    result = cli_runner.invoke(profile_api_schema)
+
+    assert result.exit_code == 0
+    phases = [line.split()[0] for line in result.output.splitlines()
+              if line.strip()]
+    for phase in ("yaml", "sanitizer", "parse_imports",
+                  "extract_definitions", "path_rewrite"):
+        assert phase in phases
+    assert "/cats/<int:cat_id> (cat)" in result.output
+    with app.app_context():
+        assert swagger.get_apispecs(swagger.config["specs"][0]["endpoint"])
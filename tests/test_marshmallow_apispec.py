@@ -0,0 +1,86 @@
+from flask import Flask
+
+import flasgger.utils
+from flasgger import Schema, Swagger, SwaggerView, fields
+
+
+class Cat(Schema):
+    name = fields.Str(required=True)
+
+
+class CatView(SwaggerView):
+    parameters = Cat
+    responses = {200: {'description': 'A cat'}}
+    validation = True
+
+    def post(self):
+        return 'ok'
+
+
+def test_swagger_view_validation_specs_are_cached(monkeypatch):
+    app = Flask(__name__)
+    Swagger(app)
+    app.add_url_rule('/cats', view_func=CatView.as_view('cats'),
+                     methods=['POST'])
+
+    converted = []
+    convert_schemas = flasgger.marshmallow_apispec.convert_schemas
+
+    def counting_convert_schemas(d, *args, **kwargs):
+        if 'summary' in d:  # not a recursive call
+            converted.append(d)
+        return convert_schemas(d, *args, **kwargs)
+
+    monkeypatch.setattr(flasgger.marshmallow_apispec, 'convert_schemas',
+                        counting_convert_schemas)
+
+    client = app.test_client()
+    assert client.post('/cats', json={'name': 'Tom'}).status_code == 200
+    assert client.post('/cats', json={'age': 1}).status_code == 400
+    assert len(converted) == 1
+
+    specs = CatView._validation_specs[1]
+    monkeypatch.setattr(CatView, 'summary', 'Cats')
+    assert client.post('/cats', json={'name': 'Tom'}).status_code == 200
+    assert len(converted) == 2
+    assert CatView._validation_specs[1] is not specs
+
+
+def test_schema_specs_dict_is_cached():
+    class Dog(Schema):
+        name = fields.Str(required=True)
+        swag_in = 'query'
+
+    specs = Dog().to_specs_dict()
+    assert Dog().to_specs_dict() is specs
+    assert specs['parameters'][0]['in'] == 'query'
+
+    Dog.swag_in = 'body'
+    assert Dog().to_specs_dict()['parameters'][0]['in'] == 'body'
+
+
+def test_swag_annotation_validation_compiles_once(monkeypatch):
+    class Body(Schema):
+        name = fields.Str(required=True)
+
+    app = Flask(__name__)
+    Swagger(app)
+
+    def create(body: Body):
+        return 'ok'
+
+    app.add_url_rule('/dogs', 'dogs', create, methods=['POST'], swag=True)
+
+    compiled = []
+    compile_schema = flasgger.utils.compile_schema
+
+    def counting_compile_schema(*args, **kwargs):
+        compiled.append(args)
+        return compile_schema(*args, **kwargs)
+
+    monkeypatch.setattr(flasgger.utils, 'compile_schema',
+                        counting_compile_schema)
+    client = app.test_client()
+    assert client.post('/dogs', json={'name': 'Rex'}).status_code == 200
+    assert client.post('/dogs', json={'age': 3}).status_code == 400
+    assert len(compiled) == 1
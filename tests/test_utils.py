@@ -1,4 +1,11 @@
-from flasgger.utils import is_openapi3
+import yaml
+import codecs
+import os
+import time
+import flasgger.utils
+from flask import Flask
+from flasgger import swag_from
+from flasgger.utils import is_openapi3, get_caller_root_path, get_yaml_loader
 
 
 def test_isopenapi_3_false():
@@ -14,3 +21,168 @@ def test_isopenapi_3_true():
     assert is_openapi3("3.3.3.3")
     assert is_openapi3(3)
     assert is_openapi3(3.0)
+
+
+def test_validate_compiles_schema_once(monkeypatch, tmp_path):
+    flasgger.utils.compiled_schemas.clear()
+    calls = []
+    compile_schema = flasgger.utils.compile_schema
+
+    def counting_compile_schema(*args, **kwargs):
+        calls.append(args)
+        return compile_schema(*args, **kwargs)
+
+    monkeypatch.setattr(flasgger.utils, 'compile_schema',
+                        counting_compile_schema)
+
+    spec_file = tmp_path / 'cat.yml'
+    spec_file.write_text(
+        'parameters:\n'
+        '  - in: body\n'
+        '    name: body\n'
+        '    schema:\n'
+        '      id: Cat\n'
+        '      required: [name]\n'
+        '      properties:\n'
+        '        name: {type: string}\n'
+    )
+    specs = {
+        'parameters': [{'in': 'body', 'name': 'body',
+                        'schema': {'$ref': '#/definitions/Dog'}}],
+        'definitions': {'Dog': {'type': 'object', 'required': ['name']}},
+    }
+
+    app = Flask(__name__)
+
+    @app.route('/cats', methods=['POST'])
+    @swag_from(str(spec_file), validation=True)
+    def cats():
+        return 'ok'
+
+    @app.route('/dogs', methods=['POST'])
+    @swag_from(specs, validation=True)
+    def dogs():
+        return 'ok'
+
+    client = app.test_client()
+    for url in ('/cats', '/dogs'):
+        assert client.post(url, json={'name': 'Tom'}).status_code == 200
+        assert client.post(url, json={'age': 1}).status_code == 400
+    assert len(calls) == 2
+
+
+def test_validate_uses_yaml_loader_config(tmp_path):
+    flasgger.utils.compiled_schemas.clear()
+    flasgger.utils.yaml_cache.clear()
+    loaded = []
+
+    class RecordingLoader(yaml.SafeLoader):
+        def __init__(self, stream):
+            loaded.append(stream)
+            super(RecordingLoader, self).__init__(stream)
+
+    (tmp_path / 'name.yml').write_text('type: string\n')
+    spec_file = tmp_path / 'cat.yml'
+    spec_file.write_text(
+        'parameters:\n'
+        '  - in: body\n'
+        '    name: body\n'
+        '    schema:\n'
+        '      id: Cat\n'
+        '      required: [name]\n'
+        '      properties:\n'
+        '        name: {$ref: name.yml}\n'
+    )
+
+    app = Flask(__name__)
+    app.config['SWAGGER'] = {'yaml_loader': RecordingLoader}
+    flasgger.Swagger(app)
+
+    @app.route('/cats', methods=['POST'])
+    @swag_from(str(spec_file), validation=True)
+    def cats():
+        return 'ok'
+
+    client = app.test_client()
+    assert client.post('/cats', json={'name': 1}).status_code == 400
+    # the file of the view and the one it references
+    assert len(loaded) == 2
+
+
+def test_get_caller_root_path():
+    def validate_like():
+        return get_caller_root_path()
+
+    assert validate_like() == os.path.dirname(os.path.abspath(__file__))
+
+
+def test_read_file_cache(tmp_path, monkeypatch):
+    spec_file = tmp_path / 'spec.yml'
+    spec_file.write_bytes(codecs.BOM_UTF8 + b'a: 1\n')
+    assert flasgger.utils.read_file(str(spec_file)) == 'a: 1\n'
+
+    opened = []
+    real_open = open
+
+    def counting_open(path, *args, **kwargs):
+        opened.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr('builtins.open', counting_open)
+    assert flasgger.utils.read_file(str(spec_file)) == 'a: 1\n'
+    assert opened == []
+
+    spec_file.write_text('a: 22\n')
+    assert flasgger.utils.read_file(str(spec_file)) == 'a: 22\n'
+    assert opened == [str(spec_file)]
+
+
+def test_load_yaml_returns_copies():
+    first = flasgger.utils.load_yaml('a: [1, 2]\n')
+    first['a'].append(3)
+    assert flasgger.utils.load_yaml('a: [1, 2]\n') == {'a': [1, 2]}
+
+
+def test_resize_caches(monkeypatch):
+    for name in ('compiled_schemas', 'file_cache', 'yaml_cache'):
+        cache = getattr(flasgger.utils, name)
+        monkeypatch.setattr(cache, 'maxsize', cache.maxsize)
+    flasgger.utils.yaml_cache.clear()
+    flasgger.utils.load_yaml('a: 1\n')
+    flasgger.utils.load_yaml('b: 2\n')
+
+    app = Flask(__name__)
+    app.config['SWAGGER'] = {'compiled_schemas_cache_size': 1024,
+                             'yaml_cache_size': 1}
+    flasgger.Swagger(app)
+    assert flasgger.utils.compiled_schemas.maxsize == 1024
+    assert flasgger.utils.file_cache.maxsize == 512
+    assert len(flasgger.utils.yaml_cache) == 1
+
+    flasgger.utils.yaml_cache.resize(0)
+    assert len(flasgger.utils.yaml_cache) == 0
+    assert flasgger.utils.load_yaml('a: 1\n') == {'a': 1}
+    assert len(flasgger.utils.yaml_cache) == 0
+
+
+def test_get_yaml_loader():
+    assert get_yaml_loader('python') is yaml.SafeLoader
+    assert get_yaml_loader(yaml.BaseLoader) is yaml.BaseLoader
+    if yaml.__with_libyaml__:
+        assert get_yaml_loader() is yaml.CSafeLoader
+        assert get_yaml_loader('c') is yaml.CSafeLoader
+    else:
+        assert get_yaml_loader() is yaml.SafeLoader
+    assert flasgger.utils.load_yaml('a: 1', 'python') == {'a': 1}
+
+
+def test_specs_profile_nested_phases():
+    assert flasgger.utils.get_specs_profile() is None
+    with flasgger.utils.SpecsProfile() as profile:
+        with flasgger.utils.profile_phase('outer'):
+            with flasgger.utils.profile_phase('inner'):
+                time.sleep(0.01)
+    assert flasgger.utils.get_specs_profile() is None
+    assert profile.phases['inner'][0] == profile.phases['outer'][0] == 1
+    assert profile.phases['outer'][1] < 0.01 <= profile.phases['inner'][1]
+    assert profile.elapsed >= 0.01